@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import metrics
+from .models import JobListing
+
+
+DEFAULT_ARTIFACT_ROOT = Path("artifacts/cover_letters")
+ARTIFACT_MODES = ("sharded", "packed")
+_STOP = object()
+
+
+class ArtifactStore:
+    def __init__(
+        self,
+        root: Path = DEFAULT_ARTIFACT_ROOT,
+        mode: str = "sharded",
+        run_id: Optional[str] = None,
+        max_pending: int = 1024,
+    ) -> None:
+        if mode not in ARTIFACT_MODES:
+            raise ValueError(f"Unknown artifact mode {mode!r}; expected one of {', '.join(ARTIFACT_MODES)}")
+        self.root = root
+        self.mode = mode
+        self.run_id = run_id or datetime.utcnow().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        self.written = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._errors: List[BaseException] = []
+        self._pack: Optional[IO[bytes]] = None
+        self._index: Optional[IO[str]] = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._drain, name="artifact-writer", daemon=True)
+        self._writer.start()
+
+    def put(self, job: JobListing, content: str) -> str:
+        if self._closed:
+            raise RuntimeError("ArtifactStore is closed")
+        key = artifact_key(job)
+        self._queue.put((key, job, content))
+        return key
+
+    def flush(self) -> None:
+        self._queue.join()
+        self._raise_errors()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._raise_errors()
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / f"{key}.txt"
+
+    @property
+    def pack_path(self) -> Path:
+        return self.root / "packs" / f"{self.run_id}.pack"
+
+    @property
+    def index_path(self) -> Path:
+        if self.mode == "packed":
+            return self.root / "packs" / f"{self.run_id}.idx.jsonl"
+        return self.root / "index.jsonl"
+
+    def _drain(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is _STOP:
+                        return
+                    key, job, content = item
+                    try:
+                        started = time.perf_counter()
+                        self._write(key, job, content.encode("utf-8"))
+                        self.written += 1
+                        metrics.observe("artifact_write_seconds", time.perf_counter() - started, mode=self.mode)
+                    except BaseException as exc:  # noqa: BLE001 - re-raised from flush()/close()
+                        self._errors.append(exc)
+                finally:
+                    self._queue.task_done()
+        finally:
+            for handle in (self._pack, self._index):
+                if handle is not None:
+                    handle.close()
+
+    def _write(self, key: str, job: JobListing, payload: bytes) -> None:
+        entry: Dict[str, Any] = {
+            "key": key,
+            "job_id": job.id,
+            "platform": job.platform,
+            "company": job.company,
+            "title": job.title,
+            "sha1": hashlib.sha1(payload).hexdigest(),
+        }
+        if self.mode == "packed":
+            pack = self._open_pack()
+            entry["offset"] = pack.tell()
+            entry["length"] = len(payload)
+            pack.write(payload)
+            pack.flush()
+        else:
+            path = self.path_for(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, payload)
+            entry["path"] = str(path.relative_to(self.root))
+        index = self._open_index()
+        index.write(json.dumps(entry) + "\n")
+        index.flush()
+
+    def _open_pack(self) -> IO[bytes]:
+        if self._pack is None:
+            self.pack_path.parent.mkdir(parents=True, exist_ok=True)
+            self._pack = self.pack_path.open("ab")
+        return self._pack
+
+    def _open_index(self) -> IO[str]:
+        if self._index is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._index = self.index_path.open("a", encoding="utf-8")
+        return self._index
+
+    def _raise_errors(self) -> None:
+        if self._errors:
+            error, self._errors = self._errors[0], []
+            raise error
+
+
+def artifact_key(job: JobListing) -> str:
+    return hashlib.sha1(f"{job.platform}\x00{job.id}".encode("utf-8")).hexdigest()
+
+
+def iter_packed(index_path: Path) -> Iterator[Tuple[Dict[str, Any], str]]:
+    pack_path = index_path.with_name(index_path.name.replace(".idx.jsonl", ".pack"))
+    with index_path.open("r", encoding="utf-8") as index, pack_path.open("rb") as pack:
+        for line in index:
+            entry = json.loads(line)
+            pack.seek(entry["offset"])
+            yield entry, pack.read(entry["length"]).decode("utf-8")
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
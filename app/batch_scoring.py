@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from .matching import JobIndex, _combine_score, score_job
+from .metrics import metrics
+from .models import MatchResult, Resume, UserPreferences
+
+# Jobs are encoded column-wise: every vocabulary term maps to one Python int whose
+# bit ``p`` is set when job ``p`` contains the term. Hit counts are kept as
+# bit-sliced counters (one int per binary digit), so each scoring step is a
+# handful of whole-corpus AND/XOR operations instead of a per-job loop.
+
+
+class BatchScorer:
+    def __init__(self, index: JobIndex) -> None:
+        self.index = index
+        self.size = len(index)
+        self.all_jobs = (1 << self.size) - 1
+        self._columns: Dict[str, int] = {}
+
+    def column(self, token: str) -> int:
+        bits = self._columns.get(token)
+        if bits is None:
+            bits = _to_bitset(self.index.postings.get(token, ()), self.size)
+            self._columns[token] = bits
+        return bits
+
+    def top_k(self, resume: Resume, prefs: UserPreferences, k: int) -> List[MatchResult]:
+        if k <= 0 or not self.size:
+            return []
+        with metrics.stage("batch_top_k") as stage:
+            positions = [position for _, position in self._ranked(resume, prefs, k)]
+            stage.items = self.size
+            return [score_job(resume, self.index.jobs[position], prefs) for position in positions]
+
+    def top_k_many(self, profiles: Iterable[Tuple[Resume, UserPreferences]], k: int) -> List[List[MatchResult]]:
+        return [self.top_k(resume, prefs, k) for resume, prefs in profiles]
+
+    def _ranked(self, resume: Resume, prefs: UserPreferences, k: int) -> List[Tuple[float, int]]:
+        title_bits = _to_bitset(self.index.matching_titles(prefs.target_titles), self.size)
+        location_bits = _to_bitset(self.index.matching_locations(prefs.target_locations), self.size)
+        required = _bit_counter(self.column(skill) for skill in prefs.required_skills)
+        optional = _bit_counter(self.column(skill) for skill in prefs.optional_skills)
+        skills = _bit_counter(self.column(skill) for skill in resume.skills)
+
+        by_score: Dict[float, int] = defaultdict(int)
+        for title_match, title_group in _split(self.all_jobs, title_bits):
+            for location_match, group in _split(title_group, location_bits):
+                for required_hits, required_group in _split_counts(group, required):
+                    for optional_hits, optional_group in _split_counts(required_group, optional):
+                        for skill_hits, skill_group in _split_counts(optional_group, skills):
+                            score = _combine_score(
+                                required_hits,
+                                len(prefs.required_skills),
+                                optional_hits,
+                                skill_hits,
+                                title_match,
+                                location_match,
+                            )
+                            by_score[score] |= skill_group
+
+        ranked: List[Tuple[float, int]] = []
+        for score in sorted(by_score, reverse=True):
+            for position in _iter_bits(by_score[score]):
+                ranked.append((score, position))
+                if len(ranked) >= k:
+                    return ranked
+        return ranked
+
+
+def _to_bitset(positions: Iterable[int], size: int) -> int:
+    packed = bytearray((size + 7) // 8)
+    for position in positions:
+        packed[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(packed, "little")
+
+
+def _bit_counter(columns: Iterable[int]) -> List[int]:
+    planes: List[int] = []
+    for carry in columns:
+        for digit, plane in enumerate(planes):
+            planes[digit], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def _split(group: int, bits: int) -> List[Tuple[bool, int]]:
+    parts = [(True, group & bits), (False, group & ~bits)]
+    return [(flag, part) for flag, part in parts if part]
+
+
+def _split_counts(group: int, planes: List[int]) -> List[Tuple[int, int]]:
+    parts = [(0, group)]
+    for digit in range(len(planes) - 1, -1, -1):
+        plane = planes[digit]
+        refined: List[Tuple[int, int]] = []
+        for value, part in parts:
+            ones = part & plane
+            zeros = part & ~plane
+            if ones:
+                refined.append((value | (1 << digit), ones))
+            if zeros:
+                refined.append((value, zeros))
+        parts = refined
+    return parts
+
+
+def _iter_bits(bits: int) -> Iterable[int]:
+    digits = bin(bits)[:1:-1]
+    position = digits.find("1")
+    while position != -1:
+        yield position
+        position = digits.find("1", position + 1)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .batch_scoring import BatchScorer
+from .config import DEFAULT_CONFIG_PATH, load_preferences
+from .corpus import CorpusScraper
+from .job_scraper import scraper_for_path
+from .job_store import JobBatch
+from .matching import JobIndex
+from .models import Resume
+from .resume_cache import ResumeCache
+from .resume_parser import DEFAULT_KNOWN_SKILLS, parse_resume
+
+
+RESUME_SUFFIXES = {".pdf", ".docx", ".txt"}
+
+
+@dataclass
+class BulkParseResult:
+    path: str
+    resume: Optional[Resume] = None
+    error: Optional[str] = None
+
+
+def iter_resume_paths(source: Path) -> Iterator[Path]:
+    if source.is_dir():
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                path = Path(root) / name
+                if path.suffix.lower() in RESUME_SUFFIXES:
+                    yield path
+        return
+    # anything else is a manifest: one resume path per line, relative to the manifest
+    with source.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                path = Path(line)
+                yield path if path.is_absolute() else source.parent / path
+
+
+def parse_resumes_bulk(
+    paths: Iterable[Path],
+    known_skills: Iterable[str],
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[BulkParseResult]:
+    skills = sorted({skill.lower() for skill in known_skills})
+    workers = workers or os.cpu_count() or 1
+    cache = str(cache_dir) if cache_dir else None
+    in_flight: Set[Future] = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            in_flight.add(pool.submit(_parse_one, str(path), skills, cache))
+            # keep a bounded window of outstanding work so huge manifests stream instead of queueing
+            if len(in_flight) >= workers * 4:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def write_resume_store(results: Iterable[BulkParseResult], store_path: Path) -> Tuple[int, int]:
+    parsed = failed = 0
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    with _open_store(store_path, "w") as fh:
+        for result in results:
+            if result.resume is None:
+                failed += 1
+                print(f"Failed to parse {result.path}: {result.error}")
+                continue
+            fh.write(json.dumps({"path": result.path, "resume": asdict(result.resume)}, separators=(",", ":")))
+            fh.write("\n")
+            parsed += 1
+    return parsed, failed
+
+
+def iter_resume_store(store_path: Path) -> Iterator[Tuple[str, Resume]]:
+    with _open_store(store_path, "r") as fh:
+        for line in fh:
+            if line.strip():
+                record = json.loads(line)
+                yield record["path"], Resume(**record["resume"])
+
+
+def score_resume_store(
+    store_path: Path, jobs_path: Path, config_path: Path, output_path: Path, top_k: int = 10
+) -> int:
+    prefs = load_preferences(config_path)
+    scraper = scraper_for_path(jobs_path, hard_filters=prefs.hard_filters)
+    if isinstance(scraper, CorpusScraper) and not prefs.hard_filters:
+        jobs: JobBatch = scraper.corpus
+    else:
+        jobs = JobBatch.from_jobs(scraper.iter_jobs(prefs.target_titles, prefs.target_locations))
+    scorer = BatchScorer(JobIndex(jobs))
+    scored = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as out:
+        for path, resume in iter_resume_store(store_path):
+            matches = scorer.top_k(resume, prefs, top_k)
+            out.write(
+                json.dumps(
+                    {
+                        "path": path,
+                        "matches": [
+                            {"job_id": match.job.id, "title": match.job.title, "company": match.job.company, "score": match.score}
+                            for match in matches
+                        ],
+                    }
+                )
+            )
+            out.write("\n")
+            scored += 1
+    return scored
+
+
+def _parse_one(path: str, known_skills: List[str], cache_dir: Optional[str]) -> BulkParseResult:
+    try:
+        cache = ResumeCache(Path(cache_dir)) if cache_dir else None
+        return BulkParseResult(path=path, resume=parse_resume(Path(path), known_skills, cache=cache))
+    except Exception as exc:  # noqa: BLE001 - a bad file must not stop the batch
+        return BulkParseResult(path=path, error=f"{type(exc).__name__}: {exc}")
+
+
+def _open_store(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk resume ingestion and scoring")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parse_cmd = commands.add_parser("parse", help="Parse a directory or manifest of resumes into a store")
+    parse_cmd.add_argument("source", help="Directory of resumes or a manifest file with one path per line")
+    parse_cmd.add_argument("--out", default="logs/resumes.jsonl.gz", help="Resume store to write (.jsonl or .jsonl.gz)")
+    parse_cmd.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parse_cmd.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="Preferences JSON used for the skill vocabulary")
+    parse_cmd.add_argument("--cache-dir", default=None, help="Optional parsed-resume cache directory")
+
+    score_cmd = commands.add_parser("score", help="Score every resume in a store against a job corpus")
+    score_cmd.add_argument("--store", default="logs/resumes.jsonl.gz", help="Resume store written by `parse`")
+    score_cmd.add_argument("--jobs", default="app/data/sample_jobs.json", help="Job listing JSON/JSONL fixture or .corpus file")
+    score_cmd.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="Path to preferences JSON")
+    score_cmd.add_argument("--out", default="logs/bulk_matches.jsonl", help="JSON Lines output with top matches per resume")
+    score_cmd.add_argument("--top-k", type=int, default=10, help="Matches kept per resume")
+
+    args = parser.parse_args(argv)
+    if args.command == "parse":
+        prefs = load_preferences(Path(args.config))
+        known_skills = {*DEFAULT_KNOWN_SKILLS, *prefs.required_skills, *prefs.optional_skills}
+        results = parse_resumes_bulk(
+            iter_resume_paths(Path(args.source)),
+            known_skills,
+            workers=args.workers,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        )
+        parsed, failed = write_resume_store(results, Path(args.out))
+        print(f"Parsed {parsed} resume(s), {failed} failure(s). Store written to {args.out}")
+    else:
+        scored = score_resume_store(Path(args.store), Path(args.jobs), Path(args.config), Path(args.out), top_k=args.top_k)
+        print(f"Scored {scored} resume(s). Matches written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from .job_filter import HARD_FILTERS
 from .models import UserPreferences
 
 
@@ -23,6 +24,17 @@ def load_preferences(path: Path = DEFAULT_CONFIG_PATH) -> UserPreferences:
         required_skills=[s.lower() for s in raw.get("required_skills", [])],
         optional_skills=[s.lower() for s in raw.get("optional_skills", [])],
         throttle_seconds=float(raw.get("throttle_seconds", 2.0)),
+        platform_throttle_seconds={
+            platform: float(seconds) for platform, seconds in raw.get("platform_throttle_seconds", {}).items()
+        },
         review_mode=bool(raw.get("review_mode", False)),
         min_score=float(raw.get("min_score", 0.45)),
+        hard_filters=_hard_filters(raw.get("hard_filters", [])),
     )
+
+
+def _hard_filters(names: Any) -> List[str]:
+    unknown = sorted(set(names) - set(HARD_FILTERS))
+    if unknown:
+        raise ValueError(f"Unknown hard_filters {unknown}; expected any of {list(HARD_FILTERS)}")
+    return list(names)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .job_scraper import BaseScraper, iter_json_records, job_from_raw
+from .job_store import CategoryColumn, JobBatch, StringColumn, TokenColumn, intern_text
+from .matching import _tokenize
+from .metrics import metrics
+from .models import JobListing
+
+# Binary corpus layout (little-endian, every section 8-byte aligned):
+#
+#   header     magic "JOBCORP1", u32 version, u32 section count, u64 job count
+#   directory  one (8-byte name, u64 offset, u64 length) entry per section
+#   pool       UTF-8 string pool shared by titles, companies, locations, platforms
+#              and description tokens; "pool.off" holds u64 end offsets
+#   title, company, location, platform   u32 pool ids, one per job
+#   id, desc, url, meta                  UTF-8 text with a matching "<name>.off" u64 table
+#   tok        u32 pool ids of each job's sorted description tokens; "tok.off" u64 table
+#
+# Opening a corpus maps the file read-only and wraps the sections in memoryviews,
+# so only the string pool is decoded up front and concurrent readers share pages.
+
+MAGIC = b"JOBCORP1"
+FORMAT_VERSION = 1
+CORPUS_SUFFIX = ".corpus"
+_HEADER = struct.Struct("<8sIIQ")
+_ENTRY = struct.Struct("<8sQQ")
+_CATEGORY_SECTIONS = ("title", "company", "location", "platform")
+_TEXT_SECTIONS = ("id", "desc", "url", "meta")
+
+
+class CorpusFormatError(ValueError):
+    pass
+
+
+class JobCorpus(JobBatch):
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+        self._file = path.open("rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        count, sections = self._read_directory()
+        self.section_sizes = {name: len(view) for name, view in sections.items()}
+
+        pool_offsets = sections["pool.off"].cast("Q")
+        pool_bytes = sections["pool"]
+        pool = [
+            intern_text(str(pool_bytes[pool_offsets[index] : pool_offsets[index + 1]], "utf-8"))
+            for index in range(len(pool_offsets) - 1)
+        ]
+        self.pool = pool
+        self.titles, self.companies, self.locations, self.platforms = (
+            CategoryColumn(pool, sections[name].cast("I")) for name in _CATEGORY_SECTIONS
+        )
+        self.ids, self.descriptions, self.urls, self._meta = (
+            StringColumn(sections[name], sections[f"{name}.off"].cast("Q")) for name in _TEXT_SECTIONS
+        )
+        self.tokens = TokenColumn(pool, sections["tok.off"].cast("Q"), sections["tok"].cast("I"))
+        if any(len(column) != count for column in (self.ids, self.titles, self.tokens)):
+            raise CorpusFormatError(f"{path} is truncated or inconsistent: expected {count} job(s)")
+
+    def append(self, job: JobListing) -> None:
+        raise TypeError("JobCorpus is read-only; rebuild it with write_corpus()")
+
+    def close(self) -> None:
+        # memoryviews into the map must be released before the map itself
+        self.titles = self.companies = self.locations = self.platforms = CategoryColumn()
+        self.ids = self.descriptions = self.urls = self._meta = StringColumn()
+        self.tokens = None
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "JobCorpus":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _metadata(self, position: int) -> Dict[str, str]:
+        raw = self._meta[position]
+        return json.loads(raw) if raw else {}
+
+    def _read_directory(self) -> Tuple[int, Dict[str, memoryview]]:
+        if len(self._mmap) < _HEADER.size:
+            raise CorpusFormatError(f"{self.path} is too small to be a job corpus")
+        magic, version, section_count, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise CorpusFormatError(f"{self.path} is not a job corpus (bad magic {magic!r})")
+        if version != FORMAT_VERSION:
+            raise CorpusFormatError(f"{self.path} uses corpus format {version}; expected {FORMAT_VERSION}")
+        sections: Dict[str, memoryview] = {}
+        for index in range(section_count):
+            name, offset, length = _ENTRY.unpack_from(self._mmap, _HEADER.size + index * _ENTRY.size)
+            sections[name.rstrip(b"\0").decode("ascii")] = self._view[offset : offset + length]
+        return count, sections
+
+
+class CorpusScraper(BaseScraper):
+    def __init__(self, corpus_path: Path, hard_filters: Iterable[str] = ()) -> None:
+        self.corpus_path = corpus_path
+        self.hard_filters = frozenset(hard_filters)
+        self._corpus: Optional[JobCorpus] = None
+
+    @property
+    def name(self) -> str:
+        return f"corpus:{self.corpus_path.name}"
+
+    @property
+    def corpus(self) -> JobCorpus:
+        if self._corpus is None:
+            self._corpus = JobCorpus(self.corpus_path)
+        return self._corpus
+
+    def fetch_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> List[JobListing]:
+        return list(self.iter_jobs(keywords, locations))
+
+    def iter_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> Iterator[JobListing]:
+        corpus = self.corpus
+        job_filter = self.job_filter(keywords, locations)
+        if job_filter is None:
+            return iter(corpus)
+        # matched on the title/location codes, so rejected rows are never decoded
+        positions = job_filter.positions(corpus)
+        metrics.inc("jobs_filtered_total", len(corpus) - len(positions), source=self.name)
+        return (corpus[position] for position in positions)
+
+
+def open_corpus(path: Path) -> JobCorpus:
+    return JobCorpus(path)
+
+
+def write_corpus(jobs: Iterable[JobListing], out_path: Path) -> int:
+    pool: Dict[str, int] = {}
+    pool_offsets = array("Q", [0])
+    categories = {name: array("I") for name in _CATEGORY_SECTIONS}
+    text_offsets = {name: array("Q", [0]) for name in _TEXT_SECTIONS}
+    token_offsets = array("Q", [0])
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # variable-length sections can be larger than memory, so they are spooled to disk
+    with tempfile.TemporaryDirectory(dir=out_path.parent, prefix=".corpus-") as tmp:
+        spools = {name: open(os.path.join(tmp, name), "w+b") for name in (*_TEXT_SECTIONS, "tok", "pool")}
+        try:
+            sizes = dict.fromkeys(spools, 0)
+
+            def intern_id(value: str) -> int:
+                index = pool.get(value)
+                if index is None:
+                    index = pool[value] = len(pool)
+                    sizes["pool"] += spools["pool"].write(value.encode("utf-8"))
+                    pool_offsets.append(sizes["pool"])
+                return index
+
+            count = 0
+            for job in jobs:
+                for name, value in zip(_CATEGORY_SECTIONS, (job.title, job.company, job.location, job.platform)):
+                    categories[name].append(intern_id(value or ""))
+                texts = (job.id, job.description, job.url or "", json.dumps(job.metadata) if job.metadata else "")
+                for name, value in zip(_TEXT_SECTIONS, texts):
+                    sizes[name] += spools[name].write(value.encode("utf-8"))
+                    text_offsets[name].append(sizes[name])
+                token_ids = array("I", sorted(intern_id(token) for token in _tokenize(job.description)))
+                sizes["tok"] += spools["tok"].write(token_ids.tobytes())
+                token_offsets.append(sizes["tok"] // token_ids.itemsize)
+                count += 1
+
+            sections: List[Tuple[str, Any]] = [("pool", spools["pool"]), ("pool.off", pool_offsets)]
+            sections += [(name, categories[name]) for name in _CATEGORY_SECTIONS]
+            for name in _TEXT_SECTIONS:
+                sections += [(name, spools[name]), (f"{name}.off", text_offsets[name])]
+            sections += [("tok", spools["tok"]), ("tok.off", token_offsets)]
+
+            tmp_path = Path(tmp) / "corpus"
+            with tmp_path.open("wb") as out:
+                _write_sections(out, sections, count)
+            os.replace(tmp_path, out_path)
+        finally:
+            for handle in spools.values():
+                handle.close()
+    return count
+
+
+def convert_json(sources: Iterable[Path], out_path: Path) -> int:
+    return write_corpus((job_from_raw(raw) for source in sources for raw in iter_json_records(source)), out_path)
+
+
+def _write_sections(out: IO[bytes], sections: List[Tuple[str, Any]], count: int) -> None:
+    directory_size = _HEADER.size + _ENTRY.size * len(sections)
+    out.write(b"\0" * directory_size)
+    entries = []
+    for name, payload in sections:
+        out.write(b"\0" * (-out.tell() % 8))
+        offset = out.tell()
+        if isinstance(payload, array):
+            payload.tofile(out)
+        else:
+            payload.seek(0)
+            shutil.copyfileobj(payload, out, 1 << 20)
+        entries.append(_ENTRY.pack(name.encode("ascii"), offset, out.tell() - offset))
+    out.seek(0)
+    out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), count))
+    out.write(b"".join(entries))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or inspect a memory-mapped job corpus")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Convert JSON/JSONL job fixtures into one binary corpus")
+    build_cmd.add_argument("sources", nargs="+", help="Job listing JSON array or JSON Lines files")
+    build_cmd.add_argument("--out", required=True, help=f"Corpus file to write (conventionally *{CORPUS_SUFFIX})")
+
+    info_cmd = commands.add_parser("info", help="Print job count and section sizes of a corpus")
+    info_cmd.add_argument("corpus", help="Corpus file written by `build`")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = convert_json([Path(source) for source in args.sources], Path(args.out))
+        print(f"Wrote {count} job(s) to {args.out}")
+    else:
+        with open_corpus(Path(args.corpus)) as corpus:
+            print(f"{args.corpus}: {len(corpus)} job(s), {len(corpus.pool)} pooled string(s)")
+            for name, size in corpus.section_sizes.items():
+                print(f"  {name:<9} {size:>14,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import JobListing
+
+
+SHINGLE_SIZE = 3
+_EMPTY_BIN = (1 << 64) - 1
+_COMPANY_SUFFIXES = frozenset({"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "plc", "sa"})
+
+
+@dataclass
+class DedupResult:
+    jobs: List[JobListing] = field(default_factory=list)
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    merged: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def merged_count(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+
+def dedupe_jobs(
+    jobs: Iterable[JobListing], threshold: float = 0.85, num_perm: int = 64, bands: int = 16
+) -> DedupResult:
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    rows = num_perm // bands
+    result = DedupResult()
+    seen_keys: Dict[Tuple[str, str], int] = {}
+    signatures: List[Optional[List[int]]] = []
+    buckets: Dict[Tuple[int, str, Tuple[int, ...]], int] = {}
+
+    for job in jobs:
+        # postings are only compared within a company; whether two of them are the same role is
+        # decided by their title and description, so location spellings ("New York, NY") don't matter
+        company = _company(job)
+        title = sorted(set(_normalize(job.title).split()))
+        description = _normalize(job.description).split()
+        key = (company, " ".join(title + ["|"] + description))
+        kept = seen_keys.get(key)
+        if kept is not None:
+            result.exact_duplicates += 1
+            _merge(result, kept, job)
+            continue
+
+        signature = _minhash(title, description, num_perm)
+        if signature is not None:
+            kept = _find_near_duplicate(signature, company, signatures, buckets, rows, bands, threshold)
+            if kept is not None:
+                result.near_duplicates += 1
+                _merge(result, kept, job)
+                continue
+
+        position = len(result.jobs)
+        seen_keys[key] = position
+        result.jobs.append(job)
+        signatures.append(signature)
+        if signature is not None:
+            for band in range(bands):
+                buckets.setdefault((band, company, tuple(signature[band * rows : (band + 1) * rows])), position)
+    return result
+
+
+def _find_near_duplicate(
+    signature: List[int],
+    company: str,
+    signatures: List[Optional[List[int]]],
+    buckets: Dict[Tuple[int, str, Tuple[int, ...]], int],
+    rows: int,
+    bands: int,
+    threshold: float,
+) -> Optional[int]:
+    checked = set()
+    for band in range(bands):
+        candidate = buckets.get((band, company, tuple(signature[band * rows : (band + 1) * rows])))
+        if candidate is None or candidate in checked:
+            continue
+        checked.add(candidate)
+        other = signatures[candidate]
+        if other is not None and _similarity(signature, other) >= threshold:
+            return candidate
+    return None
+
+
+def _company(job: JobListing) -> str:
+    return " ".join(word for word in _normalize(job.company).split() if word not in _COMPANY_SUFFIXES)
+
+
+def _merge(result: DedupResult, kept: int, duplicate: JobListing) -> None:
+    result.merged.setdefault(result.jobs[kept].id, []).append(duplicate.id)
+
+
+def _minhash(title: List[str], description: List[str], num_perm: int) -> Optional[List[int]]:
+    # title words are single features so word order or an extra "Sr." costs one feature, not a run of shingles;
+    # one-permutation hashing: each feature is hashed once and lands in a single bin,
+    # so a signature costs O(features) rather than O(features * num_perm)
+    features = {f"title:{word}" for word in title}
+    for start in range(len(description) - SHINGLE_SIZE + 1):
+        features.add(" ".join(description[start : start + SHINGLE_SIZE]))
+    if not features:
+        return None
+    bins = [_EMPTY_BIN] * num_perm
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        slot, rest = value % num_perm, value // num_perm
+        if rest < bins[slot]:
+            bins[slot] = rest
+    return _densify(bins)
+
+
+def _densify(bins: List[int]) -> List[int]:
+    # fill empty bins from the next non-empty bin (rotation) so sparse texts still compare
+    if _EMPTY_BIN not in bins:
+        return bins
+    size = len(bins)
+    dense = list(bins)
+    for index in range(size):
+        if bins[index] != _EMPTY_BIN:
+            continue
+        for offset in range(1, size):
+            donor = bins[(index + offset) % size]
+            if donor != _EMPTY_BIN:
+                dense[index] = donor + offset * _EMPTY_BIN
+                break
+    return dense
+
+
+def _similarity(left: List[int], right: List[int]) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9+#]+", (text or "").lower()))
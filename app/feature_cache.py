@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+from .hashing import job_content_hash
+from .matching import _tokenize
+from .metrics import metrics
+from .models import JobListing
+
+
+DEFAULT_CACHE_PATH = Path("logs/feature_cache.sqlite")
+_LOOKUP_BATCH = 500  # bound parameters per bulk lookup; stays under SQLite's 999 limit
+_TOUCH_AFTER = 86_400.0  # rows used again within a day keep their last_used, so warm runs write nothing
+
+
+@dataclass(frozen=True)
+class JobFeatures:
+    description_tokens: FrozenSet[str]
+    title_tokens: FrozenSet[str]
+
+
+class FeatureCache:
+    def __init__(self, db_path: Path = DEFAULT_CACHE_PATH, max_entries: int = 500_000, memory_entries: int = 20_000) -> None:
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, JobFeatures]" = OrderedDict()
+        self._pending: Dict[str, JobFeatures] = {}
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_features (
+                    content_hash TEXT PRIMARY KEY,
+                    description_tokens TEXT,
+                    title_tokens TEXT,
+                    last_used REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_job_features_last_used ON job_features (last_used)")
+
+    def features(self, job: JobListing) -> JobFeatures:
+        key = job_content_hash(job)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+        return self._computed(key, job)
+
+    def description_tokens(self, job: JobListing) -> FrozenSet[str]:
+        return self.features(job).description_tokens
+
+    def iter_description_tokens(self, jobs: Iterable[JobListing]) -> Iterator[FrozenSet[str]]:
+        # bulk variant for whole-corpus passes: one query per batch instead of one per listing
+        batch: List[JobListing] = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) == _LOOKUP_BATCH:
+                yield from self._description_batch(batch)
+                batch = []
+        if batch:
+            yield from self._description_batch(batch)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+            now = time.time()
+            started = time.perf_counter()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO job_features (content_hash, description_tokens, title_tokens, last_used) VALUES (?, ?, ?, ?)",
+                    [
+                        (key, " ".join(sorted(f.description_tokens)), " ".join(sorted(f.title_tokens)), now)
+                        for key, f in pending.items()
+                    ],
+                )
+                self._conn.executemany(
+                    "UPDATE job_features SET last_used = ? WHERE content_hash = ?",
+                    [(used, key) for key, used in touched.items() if key not in pending],
+                )
+                self._evict()
+            metrics.observe("db_write_seconds", time.perf_counter() - started, table="job_features")
+            metrics.inc("db_rows_written_total", len(pending), table="job_features")
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "FeatureCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _computed(self, key: str, job: JobListing, remember: bool = True) -> JobFeatures:
+        features = JobFeatures(
+            description_tokens=frozenset(_tokenize(job.description)),
+            title_tokens=frozenset(_tokenize(job.title)),
+        )
+        with self._lock:
+            self.misses += 1
+            self._pending[key] = features
+            if remember:
+                self._remember(key, features)
+        return features
+
+    def _lookup(self, key: str) -> Optional[JobFeatures]:
+        features = self._memory.get(key)
+        if features is not None:
+            self._memory.move_to_end(key)
+            return features
+        features = self._pending.get(key)
+        if features is not None:
+            return features
+        row = self._conn.execute(
+            "SELECT description_tokens, title_tokens, last_used FROM job_features WHERE content_hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._loaded(key, row, time.time())
+
+    def _loaded(self, key: str, row: tuple, now: float) -> JobFeatures:
+        features = JobFeatures(description_tokens=_split_tokens(row[0]), title_tokens=_split_tokens(row[1]))
+        if row[2] is None or now - row[2] > _TOUCH_AFTER:
+            self._touched[key] = now
+        self._remember(key, features)
+        return features
+
+    def _description_batch(self, jobs: List[JobListing]) -> List[FrozenSet[str]]:
+        # rows read here skip the in-memory LRU and the title tokens: a bulk pass would only churn
+        # the one and never needs the other
+        keys = [job_content_hash(job) for job in jobs]
+        found: Dict[str, FrozenSet[str]] = {}
+        with self._lock:
+            for key in keys:
+                features = self._memory.get(key) or self._pending.get(key)
+                if features is not None:
+                    found[key] = features.description_tokens
+            missing = list({key for key in keys if key not in found})
+            if missing:
+                now = time.time()
+                placeholders = ", ".join("?" for _ in missing)
+                rows = self._conn.execute(
+                    f"SELECT content_hash, description_tokens, last_used FROM job_features WHERE content_hash IN ({placeholders})",
+                    missing,
+                )
+                for key, raw, last_used in rows:
+                    found[key] = _split_tokens(raw)
+                    if last_used is None or now - last_used > _TOUCH_AFTER:
+                        self._touched[key] = now
+        tokens: List[FrozenSet[str]] = []
+        hits = 0
+        for job, key in zip(jobs, keys):
+            description_tokens = found.get(key)
+            if description_tokens is None:
+                description_tokens = found[key] = self._computed(key, job, remember=False).description_tokens
+            else:
+                hits += 1
+            tokens.append(description_tokens)
+        with self._lock:
+            self.hits += hits
+        return tokens
+
+    def _remember(self, key: str, features: JobFeatures) -> None:
+        self._memory[key] = features
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM job_features").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM job_features WHERE content_hash IN "
+                "(SELECT content_hash FROM job_features ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+
+
+def _split_tokens(raw: str) -> FrozenSet[str]:
+    return frozenset(raw.split()) if raw else frozenset()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable
+
+from .models import JobListing
+
+
+def job_content_hash(job: JobListing) -> str:
+    return content_hash(job.title, job.company, job.location, job.description)
+
+
+def content_hash(title: str, company: str, location: str, description: str) -> str:
+    digest = hashlib.sha1()
+    for part in (title, company, location, description):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def bytes_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def vocabulary_hash(terms: Iterable[str]) -> str:
+    return hashlib.sha1("\n".join(sorted({term.lower() for term in terms})).encode("utf-8")).hexdigest()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import re
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from .job_store import JobBatch
+from .models import UserPreferences
+from .skill_matcher import SkillMatcher
+
+# Title/location predicates that scrapers apply before a listing is built or
+# tokenized (see BaseScraper.job_filter). A filter only ever widens what the
+# scorer's own substring checks accept: a listing that would earn title or
+# location points always passes, and normalization plus the gazetteer below let
+# "Full-Stack Engineer", "NYC" or "Austin, TX" through for "Full Stack
+# Engineer", "New York" or "United States".
+
+HARD_FILTERS = ("title", "location")
+
+_SEPARATORS = re.compile(r"[^\w+#]+")
+_MEMO_LIMIT = 65_536
+
+# alias -> canonical place, matched as whole words in normalized location text
+LOCATION_ALIASES: Dict[str, str] = {
+    "remote": "remote",
+    "anywhere": "remote",
+    "distributed": "remote",
+    "work from home": "remote",
+    "wfh": "remote",
+    "united states": "united states",
+    "united states of america": "united states",
+    "usa": "united states",
+    "us": "united states",
+    "u.s.": "united states",
+    "u.s.a.": "united states",
+    "canada": "canada",
+    "united kingdom": "united kingdom",
+    "uk": "united kingdom",
+    "great britain": "united kingdom",
+    "england": "united kingdom",
+    "germany": "germany",
+    "deutschland": "germany",
+    "europe": "europe",
+    "emea": "europe",
+    "new york": "new york",
+    "new york city": "new york",
+    "nyc": "new york",
+    "brooklyn": "new york",
+    "san francisco": "san francisco",
+    "sf": "san francisco",
+    "bay area": "san francisco",
+    "seattle": "seattle",
+    "austin": "austin",
+    "boston": "boston",
+    "chicago": "chicago",
+    "los angeles": "los angeles",
+    "toronto": "toronto",
+    "vancouver": "vancouver",
+    "london": "london",
+    "berlin": "berlin",
+    "munich": "munich",
+}
+
+# canonical place -> the regions it lies in
+LOCATION_PARENTS: Dict[str, FrozenSet[str]] = {
+    "new york": frozenset({"united states"}),
+    "san francisco": frozenset({"united states"}),
+    "seattle": frozenset({"united states"}),
+    "austin": frozenset({"united states"}),
+    "boston": frozenset({"united states"}),
+    "chicago": frozenset({"united states"}),
+    "los angeles": frozenset({"united states"}),
+    "toronto": frozenset({"canada"}),
+    "vancouver": frozenset({"canada"}),
+    "london": frozenset({"united kingdom", "europe"}),
+    "berlin": frozenset({"germany", "europe"}),
+    "munich": frozenset({"germany", "europe"}),
+    "united kingdom": frozenset({"europe"}),
+    "germany": frozenset({"europe"}),
+}
+
+US_STATE_CODES = frozenset(
+    "al ak az ar ca co ct de fl ga hi id il in ia ks ky la me md ma mi mn ms mo mt ne nv nh nj nm ny nc nd oh ok "
+    "or pa ri sc sd tn tx ut vt va wa wv wi wy dc".split()
+)
+
+_alias_matcher: Optional[SkillMatcher] = None
+_alias_places: Dict[str, str] = {}
+
+
+def normalize_text(value: str) -> str:
+    # lowercase, drop dots ("U.S." -> "us") and collapse every other separator into one space
+    return _SEPARATORS.sub(" ", value.lower().replace(".", "")).strip()
+
+
+def resolve_places(location: str, expand: bool = True) -> FrozenSet[str]:
+    global _alias_matcher
+    if _alias_matcher is None:
+        for alias, place in LOCATION_ALIASES.items():
+            _alias_places[normalize_text(alias)] = place
+        _alias_matcher = SkillMatcher(list(_alias_places))
+    places: Set[str] = {_alias_places[alias] for alias in _alias_matcher.find(normalize_text(location))}
+    # "City, ST" with a US state code
+    head, _, tail = location.rpartition(",")
+    if head and tail.strip().lower() in US_STATE_CODES:
+        places.add("united states")
+    if expand:
+        for place in list(places):
+            places.update(LOCATION_PARENTS.get(place, ()))
+    return frozenset(places)
+
+
+class JobFilter:
+    def __init__(self, titles: Iterable[str] = (), locations: Iterable[str] = ()) -> None:
+        self.titles = [title.lower() for title in titles if title.strip()]
+        self.locations = [location.lower() for location in locations if location.strip()]
+        self._title_matcher = (
+            SkillMatcher([normalize_text(title) for title in self.titles], whole_words=False) if self.titles else None
+        )
+        self._location_targets = [
+            # a listing in Austin qualifies for a "United States" target, not the other way round
+            (location, normalize_text(location), resolve_places(location, expand=False))
+            for location in self.locations
+        ]
+        self._title_memo: Dict[str, bool] = {}
+        self._location_memo: Dict[str, bool] = {}
+
+    @classmethod
+    def build(cls, titles: Iterable[str] = (), locations: Iterable[str] = ()) -> Optional["JobFilter"]:
+        job_filter = cls(titles, locations)
+        return job_filter if job_filter.titles or job_filter.locations else None
+
+    @classmethod
+    def for_preferences(cls, prefs: UserPreferences) -> Optional["JobFilter"]:
+        return cls.build(
+            prefs.target_titles if "title" in prefs.hard_filters else (),
+            prefs.target_locations if "location" in prefs.hard_filters else (),
+        )
+
+    def admits(self, title: str, location: str) -> bool:
+        return self.title_matches(title) and self.location_matches(location)
+
+    def title_matches(self, title: str) -> bool:
+        if self._title_matcher is None:
+            return True
+        matched = self._title_memo.get(title)
+        if matched is None:
+            lowered = title.lower()
+            matched = any(target in lowered for target in self.titles) or bool(
+                self._title_matcher.find_indices(normalize_text(title))
+            )
+            if len(self._title_memo) < _MEMO_LIMIT:
+                self._title_memo[title] = matched
+        return matched
+
+    def location_matches(self, location: str) -> bool:
+        if not self._location_targets:
+            return True
+        matched = self._location_memo.get(location)
+        if matched is None:
+            lowered = location.lower()
+            normalized = normalize_text(location)
+            places: Optional[FrozenSet[str]] = None
+            matched = False
+            for target, normalized_target, target_places in self._location_targets:
+                if target in lowered or (normalized_target and normalized_target in normalized):
+                    matched = True
+                    break
+                if target_places:
+                    if places is None:
+                        places = resolve_places(location)
+                    if target_places & places:
+                        matched = True
+                        break
+            if len(self._location_memo) < _MEMO_LIMIT:
+                self._location_memo[location] = matched
+        return matched
+
+    def positions(self, batch: JobBatch, stop: Optional[int] = None) -> List[int]:
+        # titles and locations are integer codes, so each distinct value is checked once
+        titles: Dict[int, bool] = {}
+        locations: Dict[int, bool] = {}
+        title_values = batch.titles.values
+        location_values = batch.locations.values
+        admitted = []
+        codes = zip(batch.titles.codes, batch.locations.codes)
+        for position, (title, location) in enumerate(codes if stop is None else islice(codes, stop)):
+            title_ok = titles.get(title)
+            if title_ok is None:
+                title_ok = titles[title] = self.title_matches(title_values[title])
+            if not title_ok:
+                continue
+            location_ok = locations.get(location)
+            if location_ok is None:
+                location_ok = locations[location] = self.location_matches(location_values[location])
+            if location_ok:
+                admitted.append(position)
+        return admitted
@@ -1,43 +1,275 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
+from .job_filter import JobFilter
+from .job_store import intern_text
+from .metrics import metrics
 from .models import JobListing
 
+if TYPE_CHECKING:
+    from .seen_jobs import SeenJobStore
+
+
+JSON_LINES_SUFFIXES = {".jsonl", ".ndjson"}
+
 
 class BaseScraper:
+    # which of the keywords/locations arguments drop listings at the source ("title", "location");
+    # otherwise they only inform scoring
+    hard_filters: FrozenSet[str] = frozenset()
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def job_filter(self, keywords: Iterable[str], locations: Iterable[str]) -> Optional[JobFilter]:
+        return JobFilter.build(
+            keywords if "title" in self.hard_filters else (),
+            locations if "location" in self.hard_filters else (),
+        )
+
     def fetch_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> List[JobListing]:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def iter_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> Iterator[JobListing]:
+        yield from self.fetch_jobs(keywords, locations)
+
 
 class MockScraper(BaseScraper):
-    def __init__(self, data_path: Path) -> None:
+    def __init__(self, data_path: Path, hard_filters: Iterable[str] = ()) -> None:
         self.data_path = data_path
+        self.hard_filters = frozenset(hard_filters)
+
+    @property
+    def name(self) -> str:
+        return f"mock:{self.data_path.name}"
+
+    def fetch_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> List[JobListing]:
+        return list(self.iter_jobs(keywords, locations))
+
+    def iter_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> Iterator[JobListing]:
+        job_filter = self.job_filter(keywords, locations)
+        if job_filter is None:
+            for raw in iter_json_records(self.data_path):
+                yield job_from_raw(raw)
+            return
+        dropped = 0
+        try:
+            for raw in iter_json_records(self.data_path):
+                # decided on the raw record, before a JobListing is built or its description tokenized
+                if job_filter.admits(raw.get("title", ""), raw.get("location", "")):
+                    yield job_from_raw(raw)
+                else:
+                    dropped += 1
+        finally:
+            # also reached when a consumer stops early and the generator is closed
+            metrics.inc("jobs_filtered_total", dropped, source=self.name)
+
+
+class StaticScraper(BaseScraper):
+    def __init__(
+        self, jobs: Sequence[JobListing], delay: float = 0.0, name: str = "static", hard_filters: Iterable[str] = ()
+    ) -> None:
+        self.jobs = list(jobs)
+        self.delay = delay
+        self._name = name
+        self.hard_filters = frozenset(hard_filters)
+
+    @property
+    def name(self) -> str:
+        return self._name
 
     def fetch_jobs(self, keywords: Iterable[str], locations: Iterable[str]) -> List[JobListing]:
-        with self.data_path.open("r", encoding="utf-8") as fh:
-            raw_jobs = json.load(fh)
-        listings: List[JobListing] = []
-        for raw in raw_jobs:
-            listings.append(
-                JobListing(
-                    id=str(raw.get("id")),
-                    title=raw.get("title", ""),
-                    company=raw.get("company", ""),
-                    location=raw.get("location", ""),
-                    description=raw.get("description", ""),
-                    platform=raw.get("platform", "mock"),
-                    url=raw.get("url"),
-                    metadata=raw.get("metadata", {}),
-                )
-            )
-        return listings
-
-
-def gather_jobs(scrapers: Iterable[BaseScraper], keywords: Iterable[str], locations: Iterable[str]) -> List[JobListing]:
+        if self.delay:
+            time.sleep(self.delay)
+        job_filter = self.job_filter(keywords, locations)
+        if job_filter is None:
+            return list(self.jobs)
+        return [job for job in self.jobs if job_filter.admits(job.title, job.location)]
+
+
+@dataclass
+class GatherResult:
+    jobs: List[JobListing] = field(default_factory=list)
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    durations: Dict[str, float] = field(default_factory=dict)
+    unchanged: int = 0
+
+
+def gather_jobs(
+    scrapers: Iterable[BaseScraper],
+    keywords: Iterable[str],
+    locations: Iterable[str],
+    max_workers: int = 1,
+    timeout: Optional[float] = None,
+    seen_store: Optional["SeenJobStore"] = None,
+) -> List[JobListing]:
+    if max_workers > 1 or timeout is not None:
+        return gather_jobs_concurrent(
+            scrapers, keywords, locations, max_workers=max_workers, timeout=timeout, seen_store=seen_store
+        ).jobs
+
     jobs: List[JobListing] = []
-    for scraper in scrapers:
-        jobs.extend(scraper.fetch_jobs(keywords, locations))
+    with metrics.stage("gather_jobs") as stage:
+        for scraper in scrapers:
+            jobs.extend(scraper.fetch_jobs(keywords, locations))
+        if seen_store is not None:
+            jobs = seen_store.filter_new(jobs)
+        stage.items = len(jobs)
     return jobs
+
+
+def gather_jobs_concurrent(
+    scrapers: Iterable[BaseScraper],
+    keywords: Iterable[str],
+    locations: Iterable[str],
+    max_workers: int = 8,
+    timeout: Optional[float] = None,
+    seen_store: Optional["SeenJobStore"] = None,
+) -> GatherResult:
+    scrapers = list(scrapers)
+    keywords = list(keywords)
+    locations = list(locations)
+    result = GatherResult()
+    if not scrapers:
+        return result
+
+    with metrics.stage("gather_jobs") as stage:
+        workers = max(1, min(max_workers, len(scrapers)))
+        # held by each fetch thread until it really finishes, so sources abandoned after a
+        # timeout still count against max_workers instead of piling up behind new fetches
+        slots = threading.BoundedSemaphore(workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_fetch_with_timeout, scraper, keywords, locations, timeout, slots) for scraper in scrapers
+            ]
+            for scraper, future in zip(scrapers, futures):
+                jobs, error, elapsed = future.result()
+                result.durations[scraper.name] = elapsed
+                metrics.observe("source_fetch_seconds", elapsed, source=scraper.name)
+                if error is not None:
+                    result.failures.append((scraper.name, error))
+                    metrics.inc("source_failures_total", source=scraper.name)
+                else:
+                    result.jobs.extend(jobs)
+        if seen_store is not None:
+            fresh = seen_store.filter_new(result.jobs)
+            result.unchanged = len(result.jobs) - len(fresh)
+            result.jobs = fresh
+        stage.items = len(result.jobs)
+    return result
+
+
+def _fetch_with_timeout(
+    scraper: BaseScraper,
+    keywords: List[str],
+    locations: List[str],
+    timeout: Optional[float],
+    slots: threading.Semaphore,
+) -> Tuple[List[JobListing], Optional[str], float]:
+    outcome: Dict[str, Any] = {}
+
+    def run() -> None:
+        try:
+            outcome["jobs"] = scraper.fetch_jobs(keywords, locations)
+        except Exception as exc:  # noqa: BLE001 - one failing source must not sink the others
+            outcome["error"] = f"{type(exc).__name__}: {exc}"
+        finally:
+            slots.release()
+
+    started = time.perf_counter()
+    if not slots.acquire(timeout=timeout):
+        return [], f"timed out after {timeout:.1f}s waiting for a fetch slot", time.perf_counter() - started
+    # fetch in a daemon thread so a hung source can be abandoned once its timeout expires
+    worker = threading.Thread(target=run, name=f"scraper-{scraper.name}", daemon=True)
+    worker.start()
+    # the timeout covers the whole source, including any wait for a slot
+    worker.join(None if timeout is None else max(timeout - (time.perf_counter() - started), 0.0))
+    elapsed = time.perf_counter() - started
+    if worker.is_alive():
+        return [], f"timed out after {timeout:.1f}s", elapsed
+    if "error" in outcome:
+        return [], outcome["error"], elapsed
+    return outcome["jobs"], None, elapsed
+
+
+def stream_jobs(scrapers: Iterable[BaseScraper], keywords: Iterable[str], locations: Iterable[str]) -> Iterator[JobListing]:
+    keywords = list(keywords)
+    locations = list(locations)
+    for scraper in scrapers:
+        yield from scraper.iter_jobs(keywords, locations)
+
+
+def scraper_for_path(path: Path, hard_filters: Iterable[str] = ()) -> BaseScraper:
+    if path.suffix == ".corpus":
+        from .corpus import CorpusScraper  # app.corpus imports this module
+
+        return CorpusScraper(path, hard_filters=hard_filters)
+    return MockScraper(path, hard_filters=hard_filters)
+
+
+def job_from_raw(raw: Dict[str, Any]) -> JobListing:
+    return JobListing(
+        id=str(raw.get("id")),
+        title=intern_text(raw.get("title", "")),
+        company=intern_text(raw.get("company", "")),
+        location=intern_text(raw.get("location", "")),
+        description=raw.get("description", ""),
+        platform=intern_text(raw.get("platform", "mock")),
+        url=raw.get("url"),
+        metadata=raw.get("metadata", {}),
+    )
+
+
+def iter_json_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as fh:
+        if path.suffix.lower() in JSON_LINES_SUFFIXES:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(fh)
+
+
+def _iter_json_array(fh: TextIO, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    exhausted = False
+    started = False
+
+    while True:
+        while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ",")):
+            pos += 1
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"Expected a JSON array of job listings in {fh.name}")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield record
+                pos = end
+                continue
+        if exhausted:
+            raise ValueError(f"Unexpected end of JSON array in {fh.name}")
+        chunk = fh.read(chunk_size)
+        exhausted = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
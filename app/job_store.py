@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from .models import JobListing
+
+# Columnar container for large corpora. Low-cardinality fields (title, company,
+# location, platform) are stored once as interned strings plus an array of
+# 32-bit codes; free text (id, description, url) lives in one shared UTF-8 buffer
+# addressed by an offsets array, so a job costs a few dozen bytes of overhead
+# instead of a JobListing with its own __dict__, strings and metadata dict.
+# JobListing objects are only built when a row is indexed.
+
+
+def intern_text(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class StringColumn:
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, buffer: Any = None, offsets: Optional[array] = None) -> None:
+        # ``buffer`` may be any sliceable bytes-like object, including an mmap
+        self.buffer = bytearray() if buffer is None else buffer
+        self.offsets = array("Q", [0]) if offsets is None else offsets
+
+    def append(self, value: str) -> None:
+        self.buffer += value.encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+    def __getitem__(self, position: int) -> str:
+        return str(self.buffer[self.offsets[position] : self.offsets[position + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self.buffer
+        offsets = self.offsets
+        for position in range(len(offsets) - 1):
+            yield str(buffer[offsets[position] : offsets[position + 1]], "utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+
+class CategoryColumn:
+    __slots__ = ("values", "codes", "_lookup")
+
+    def __init__(self, values: Optional[List[str]] = None, codes: Any = None) -> None:
+        # ``values`` may be shared between columns (e.g. one string pool); it is not copied
+        self.values: List[str] = [] if values is None else values
+        self.codes = array("I") if codes is None else codes
+        self._lookup: Optional[Dict[str, int]] = None
+
+    def append(self, value: str) -> None:
+        if self._lookup is None:
+            self._lookup = {value: code for code, value in enumerate(self.values)}
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(intern_text(value))
+        self.codes.append(code)
+
+    def __getitem__(self, position: int) -> str:
+        return self.values[self.codes[position]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[str]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def positions(self) -> Dict[str, List[int]]:
+        grouped: Dict[str, List[int]] = {}
+        values = self.values
+        for position, code in enumerate(self.codes):
+            grouped.setdefault(values[code], []).append(position)
+        return grouped
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(len(value) for value in self.values)
+
+
+class TokenColumn:
+    __slots__ = ("vocabulary", "offsets", "ids")
+
+    def __init__(self, vocabulary: List[str], offsets: Any, ids: Any) -> None:
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.ids = ids
+
+    def __getitem__(self, position: int) -> FrozenSet[str]:
+        vocabulary = self.vocabulary
+        return frozenset(vocabulary[token] for token in self.ids[self.offsets[position] : self.offsets[position + 1]])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[FrozenSet[str]]:
+        for position in range(len(self.offsets) - 1):
+            yield self[position]
+
+
+class JobBatch(Sequence[JobListing]):
+    def __init__(self) -> None:
+        self.ids = StringColumn()
+        self.titles = CategoryColumn()
+        self.companies = CategoryColumn()
+        self.locations = CategoryColumn()
+        self.platforms = CategoryColumn()
+        self.descriptions = StringColumn()
+        self.urls = StringColumn()
+        self.metadata: Dict[int, Dict[str, str]] = {}
+        # precomputed description token sets (see app.corpus); None means tokenize on demand
+        self.tokens: Optional[TokenColumn] = None
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[JobListing]) -> "JobBatch":
+        batch = cls()
+        batch.extend(jobs)
+        return batch
+
+    def append(self, job: JobListing) -> None:
+        if job.metadata:
+            self.metadata[len(self)] = job.metadata
+        self.ids.append(job.id)
+        self.titles.append(job.title)
+        self.companies.append(job.company)
+        self.locations.append(job.location)
+        self.platforms.append(job.platform)
+        self.descriptions.append(job.description)
+        self.urls.append(job.url or "")
+        self.tokens = None
+
+    def extend(self, jobs: Iterable[JobListing]) -> None:
+        for job in jobs:
+            self.append(job)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, position: int) -> JobListing: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[JobListing]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[JobListing, List[JobListing]]:
+        if isinstance(position, slice):
+            return [self._materialize(index) for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("JobBatch index out of range")
+        return self._materialize(position)
+
+    def __iter__(self) -> Iterator[JobListing]:
+        for position in range(len(self)):
+            yield self._materialize(position)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.ids, self.titles, self.companies, self.locations, self.platforms, self.descriptions, self.urls)
+        return sum(column.nbytes for column in columns)
+
+    def _materialize(self, position: int) -> JobListing:
+        return JobListing(
+            id=self.ids[position],
+            title=self.titles[position],
+            company=self.companies[position],
+            location=self.locations[position],
+            description=self.descriptions[position],
+            platform=self.platforms[position],
+            url=self.urls[position] or None,
+            metadata=self._metadata(position),
+        )
+
+    def _metadata(self, position: int) -> Dict[str, str]:
+        return dict(self.metadata.get(position, ()))
+
+
+class JobBatchView(JobBatch):
+    # rows [start, stop) of another batch, sharing its buffers and string pool. Offsets
+    # stay absolute, so slicing a memoryview-backed corpus copies nothing.
+    def __init__(self, parent: JobBatch, start: int, stop: int) -> None:
+        super().__init__()
+        self.parent = parent
+        self.start = start
+        self.ids, self.descriptions, self.urls = (
+            StringColumn(column.buffer, column.offsets[start : stop + 1])
+            for column in (parent.ids, parent.descriptions, parent.urls)
+        )
+        self.titles, self.companies, self.locations, self.platforms = (
+            CategoryColumn(column.values, column.codes[start:stop])
+            for column in (parent.titles, parent.companies, parent.locations, parent.platforms)
+        )
+        if parent.tokens is not None:
+            tokens = parent.tokens
+            self.tokens = TokenColumn(tokens.vocabulary, tokens.offsets[start : stop + 1], tokens.ids)
+
+    def append(self, job: JobListing) -> None:
+        raise TypeError("JobBatchView is read-only")
+
+    def _metadata(self, position: int) -> Dict[str, str]:
+        return self.parent._metadata(self.start + position)
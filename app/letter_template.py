@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+COVER_LETTER_PLACEHOLDERS = frozenset({"JOB_TITLE", "COMPANY", "SKILLS", "HIGHLIGHT"})
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class CompiledTemplate:
+    def __init__(self, text: str, allowed: Iterable[str] = COVER_LETTER_PLACEHOLDERS, source: str = "<string>") -> None:
+        allowed = set(allowed)
+        pieces: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        cursor = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            name = match.group(1)
+            if name not in allowed:
+                raise TemplateError(
+                    f"Unknown placeholder {{{name}}} in {source}; expected one of {', '.join(sorted(allowed))}"
+                )
+            pieces.append(text[cursor : match.start()])
+            slots.append((len(pieces), name))
+            pieces.append("")
+            cursor = match.end()
+        pieces.append(text[cursor:])
+        self.placeholders = tuple(dict.fromkeys(name for _, name in slots))
+        self._pieces = pieces
+        self._slots = slots
+
+    def render(self, values: Mapping[str, str]) -> str:
+        pieces = list(self._pieces)
+        for slot, name in self._slots:
+            pieces[slot] = values[name]
+        return "".join(pieces)
+
+
+_cache: Dict[Tuple[str, FrozenSet[str]], Tuple[int, int, CompiledTemplate]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_template(path: Path, allowed: FrozenSet[str] = COVER_LETTER_PLACEHOLDERS) -> CompiledTemplate:
+    key = (os.fspath(path), frozenset(allowed))
+    stat = os.stat(key[0])
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    template = CompiledTemplate(Path(path).read_text(encoding="utf-8"), allowed=allowed, source=str(path))
+    with _cache_lock:
+        _cache[key] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
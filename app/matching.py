@@ -1,36 +1,344 @@
 from __future__ import annotations
 
+import heapq
 import re
-from typing import Iterable, List, Set
+from collections import defaultdict
+from itertools import repeat
+from typing import TYPE_CHECKING, AbstractSet, Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
+from .job_store import JobBatch
+from .metrics import metrics
 from .models import JobListing, MatchBreakdown, MatchResult, Resume, UserPreferences
 
+if TYPE_CHECKING:
+    from .feature_cache import FeatureCache
+
+
+class JobIndex:
+    def __init__(self, jobs: Sequence[JobListing], cache: Optional["FeatureCache"] = None) -> None:
+        self.jobs = jobs
+        # rows covered by this index; ``jobs`` may keep growing for a successor (see extended)
+        self.size = len(jobs)
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.titles: Dict[str, List[int]] = defaultdict(list)
+        self.locations: Dict[str, List[int]] = defaultdict(list)
+        if isinstance(jobs, JobBatch):
+            # read the columns directly so no JobListing is built per row
+            if cache is None or jobs.tokens is not None:
+                descriptions = _batch_tokens(jobs)
+            else:
+                descriptions = cache.iter_description_tokens(jobs)
+            for position, tokens in enumerate(descriptions):
+                for token in tokens:
+                    self.postings[token].append(position)
+            for column, target in ((jobs.titles, self.titles), (jobs.locations, self.locations)):
+                for value, positions in column.positions().items():
+                    target[value.lower()].extend(positions)
+            return
+        if cache is not None:
+            jobs = list(jobs)
+            for position, (job, tokens) in enumerate(zip(jobs, cache.iter_description_tokens(jobs))):
+                self._add(position, job, tokens)
+            return
+        for position, job in enumerate(jobs):
+            self._add(position, job, _tokenize(job.description))
+
+    def extended(self, jobs: Sequence[JobListing], cache: Optional["FeatureCache"] = None) -> "JobIndex":
+        # copy-on-write: ``jobs`` holds this index's rows followed by new ones (it may be the same,
+        # grown sequence). Only the posting lists that gain a position are copied, so anyone still
+        # scoring this index is unaffected. Appended positions are larger than every existing one,
+        # so posting lists stay sorted.
+        index = JobIndex([])
+        index.jobs = jobs
+        index.size = len(jobs)
+        index.postings, index.titles, index.locations = (
+            defaultdict(list, table) for table in (self.postings, self.titles, self.locations)
+        )
+        copied: Set[Tuple[int, str]] = set()
+
+        def add(table: Dict[str, List[int]], key: str, position: int) -> None:
+            if (id(table), key) in copied:
+                table[key].append(position)
+            else:
+                copied.add((id(table), key))
+                table[key] = [*table[key], position]
+
+        for position in range(self.size, index.size):
+            job = jobs[position]
+            for token in _description_tokens(job, cache):
+                add(index.postings, token, position)
+            add(index.titles, job.title.lower(), position)
+            add(index.locations, job.location.lower(), position)
+        return index
+
+    def _add(self, position: int, job: JobListing, tokens: AbstractSet[str]) -> None:
+        for token in tokens:
+            self.postings[token].append(position)
+        self.titles[job.title.lower()].append(position)
+        self.locations[job.location.lower()].append(position)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def matching_titles(self, targets: Iterable[str]) -> Set[int]:
+        return _match_values(self.titles, targets)
+
+    def matching_locations(self, targets: Iterable[str]) -> Set[int]:
+        return _match_values(self.locations, targets)
+
+
+def score_jobs(
+    resume: Resume,
+    jobs: Union[Iterable[JobListing], JobIndex],
+    prefs: UserPreferences,
+    cache: Optional["FeatureCache"] = None,
+) -> List[MatchResult]:
+    with metrics.stage("score_jobs") as stage:
+        if isinstance(jobs, JobIndex):
+            results = _score_indexed(resume, jobs, prefs)
+        else:
+            if cache is None:
+                results = [score_job(resume, job, prefs) for job in jobs]
+            else:
+                jobs = list(jobs)
+                results = [
+                    _score_with_tokens(resume, job, tokens, prefs)
+                    for job, tokens in zip(jobs, cache.iter_description_tokens(jobs))
+                ]
+            results.sort(key=lambda m: m.score, reverse=True)
+        stage.items = len(results)
+    return results
+
+
+def top_k_matches(
+    resume: Resume,
+    jobs: Union[Iterable[JobListing], JobIndex],
+    prefs: UserPreferences,
+    k: Optional[int] = None,
+    min_score: Optional[float] = None,
+    cache: Optional["FeatureCache"] = None,
+    allowed: Optional[AbstractSet[int]] = None,
+) -> List[MatchResult]:
+    # ``allowed`` restricts an indexed search to those positions (e.g. rows passing hard filters)
+    if k is not None and k <= 0:
+        return []
+    if isinstance(jobs, JobIndex):
+        return _top_k_indexed(resume, jobs, prefs, k, min_score, allowed)
+    if allowed is not None:
+        raise TypeError("allowed positions require a JobIndex")
+
+    selection = _Selection(k, min_score, _best_score(resume, prefs, True, True))
+    targets = _Targets(prefs)
+    with metrics.stage("top_k_matches") as stage:
+        if isinstance(jobs, JobBatch) and (cache is None or jobs.tokens is not None):
+            rows: Iterable[Tuple[Any, str, str, str]] = zip(
+                jobs.tokens if jobs.tokens is not None else jobs.descriptions,
+                jobs.titles,
+                jobs.locations,
+                repeat(None),
+            )
+        else:
+            rows = ((job.description, job.title, job.location, job) for job in jobs)
+        seen = 0
+        for sequence, (text, title, location, job) in enumerate(rows):
+            if selection.saturated:
+                # every slot holds the best possible score; later rows can only lose ties
+                break
+            seen = sequence + 1
+            title_match = targets.title_match(title)
+            location_match = targets.location_match(location)
+            if not selection.admits(_best_score(resume, prefs, title_match, location_match), sequence):
+                continue
+            if isinstance(text, str):
+                lowered = text.lower()
+                # a skill can only be a token of the description if it is a substring of it; this is
+                # cheaper than both tokenizing and a cache lookup, so it runs first either way
+                if not selection.admits(
+                    _substring_bound(resume, prefs, lowered, title_match, location_match), sequence
+                ):
+                    continue
+                tokens = _tokenize(lowered) if job is None or cache is None else cache.description_tokens(job)
+            else:
+                tokens = text
+            score, breakdown = _score_fields(resume, tokens, title_match, location_match, prefs)
+            if selection.admits(score, sequence):
+                selection.push(score, sequence, (job, breakdown))
+        stage.items = seen
+    return [
+        MatchResult(job=job if job is not None else jobs[sequence], score=score, breakdown=breakdown)
+        for score, sequence, (job, breakdown) in selection.ranked()
+    ]
+
+
+def _top_k_indexed(
+    resume: Resume,
+    index: JobIndex,
+    prefs: UserPreferences,
+    k: Optional[int],
+    min_score: Optional[float],
+    allowed: Optional[AbstractSet[int]] = None,
+) -> List[MatchResult]:
+    selection = _Selection(k, min_score, _best_score(resume, prefs, True, True))
+    with metrics.stage("top_k_matches") as stage:
+        skill_hits = _collect_hits(index, resume.skills)
+        required_hits = _collect_hits(index, prefs.required_skills)
+        optional_hits = _collect_hits(index, prefs.optional_skills)
+        title_matches = index.matching_titles(prefs.target_titles)
+        location_matches = index.matching_locations(prefs.target_locations)
+
+        # required-skill hits dominate the score, so visit jobs in descending order of
+        # that count and stop at the first group whose best case cannot qualify
+        by_required: Dict[int, List[int]] = defaultdict(list)
+        for position, hits in required_hits.items():
+            by_required[len(hits)].append(position)
+        groups: List[Tuple[int, Optional[List[int]]]] = sorted(by_required.items(), reverse=True)
+        groups.append((0, None))
+        visited = 0
+        for required, positions in groups:
+            bound = _combine_score(
+                required, len(prefs.required_skills), len(prefs.optional_skills), len(resume.skills), True, True
+            )
+            if not selection.admits(bound):
+                break
+            if positions is None:
+                positions = [position for position in range(len(index)) if position not in required_hits]
+            else:
+                positions.sort()
+            if allowed is not None:
+                positions = [position for position in positions if position in allowed]
+            visited += len(positions)
+            for position in positions:
+                score = _combine_score(
+                    required,
+                    len(prefs.required_skills),
+                    len(optional_hits.get(position, ())),
+                    len(skill_hits.get(position, ())),
+                    position in title_matches,
+                    position in location_matches,
+                )
+                if selection.admits(score, position):
+                    selection.push(score, position, position)
+        stage.items = visited
 
-def score_jobs(resume: Resume, jobs: Iterable[JobListing], prefs: UserPreferences) -> List[MatchResult]:
     results: List[MatchResult] = []
-    for job in jobs:
-        results.append(score_job(resume, job, prefs))
-    results.sort(key=lambda m: m.score, reverse=True)
+    for score, position, _ in selection.ranked():
+        required = required_hits.get(position, [])
+        optional = optional_hits.get(position, [])
+        breakdown = MatchBreakdown(
+            skill_overlap=list(skill_hits.get(position, [])),
+            location_match=position in location_matches,
+            title_match=position in title_matches,
+            keyword_hits=required + optional,
+        )
+        results.append(MatchResult(job=index.jobs[position], score=score, breakdown=breakdown))
     return results
 
 
-def score_job(resume: Resume, job: JobListing, prefs: UserPreferences) -> MatchResult:
-    desc_tokens = _tokenize(job.description)
-    title_tokens = _tokenize(job.title)
-    skill_hits = [skill for skill in resume.skills if skill in desc_tokens]
-    required_hits = [skill for skill in prefs.required_skills if skill in desc_tokens]
-    optional_hits = [skill for skill in prefs.optional_skills if skill in desc_tokens]
+class _Selection:
+    # bounded max-heap of (score, -sequence, payload); ties go to the earlier sequence
+    def __init__(self, k: Optional[int], min_score: Optional[float], ceiling: float) -> None:
+        self.k = k
+        self.min_score = min_score
+        self.ceiling = ceiling
+        self.heap: List[Tuple[float, int, Any]] = []
+
+    def admits(self, bound: float, sequence: Optional[int] = None) -> bool:
+        if self.min_score is not None and bound < self.min_score:
+            return False
+        if self.k is None or len(self.heap) < self.k:
+            return True
+        if sequence is None:
+            return bound >= self.heap[0][0]
+        return (bound, -sequence) > self.heap[0][:2]
+
+    def push(self, score: float, sequence: int, payload: Any) -> None:
+        entry = (score, -sequence, payload)
+        if self.k is None or len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        else:
+            heapq.heapreplace(self.heap, entry)
+
+    @property
+    def saturated(self) -> bool:
+        return self.k is not None and len(self.heap) >= self.k and self.heap[0][0] >= self.ceiling
+
+    def ranked(self) -> List[Tuple[float, int, Any]]:
+        ordered = sorted(self.heap, key=lambda entry: entry[:2], reverse=True)
+        return [(score, -negated, payload) for score, negated, payload in ordered]
+
+
+class _Targets:
+    # titles and locations repeat heavily across listings, so match results are memoized
+    _MEMO_LIMIT = 65_536
+
+    def __init__(self, prefs: UserPreferences) -> None:
+        self.titles = [target.lower() for target in prefs.target_titles]
+        self.locations = [target.lower() for target in prefs.target_locations]
+        self._titles: Dict[str, bool] = {}
+        self._locations: Dict[str, bool] = {}
+
+    def title_match(self, title: str) -> bool:
+        matched = self._titles.get(title)
+        if matched is None:
+            lowered = title.lower()
+            matched = any(target in lowered for target in self.titles)
+            if len(self._titles) < self._MEMO_LIMIT:
+                self._titles[title] = matched
+        return matched
+
+    def location_match(self, location: str) -> bool:
+        matched = self._locations.get(location)
+        if matched is None:
+            lowered = location.lower()
+            matched = any(target in lowered for target in self.locations)
+            if len(self._locations) < self._MEMO_LIMIT:
+                self._locations[location] = matched
+        return matched
+
+
+def _best_score(resume: Resume, prefs: UserPreferences, title_match: bool, location_match: bool) -> float:
+    total = len(prefs.required_skills)
+    return _combine_score(total, total, len(prefs.optional_skills), len(resume.skills), title_match, location_match)
+
+
+def _substring_bound(
+    resume: Resume, prefs: UserPreferences, lowered: str, title_match: bool, location_match: bool
+) -> float:
+    return _combine_score(
+        sum(1 for skill in prefs.required_skills if skill in lowered),
+        len(prefs.required_skills),
+        sum(1 for skill in prefs.optional_skills if skill in lowered),
+        sum(1 for skill in resume.skills if skill in lowered),
+        title_match,
+        location_match,
+    )
+
+
+def score_job(
+    resume: Resume, job: JobListing, prefs: UserPreferences, cache: Optional["FeatureCache"] = None
+) -> MatchResult:
+    return _score_with_tokens(resume, job, _description_tokens(job, cache), prefs)
 
-    required_score = len(required_hits) / max(len(prefs.required_skills), 1)
-    optional_score = len(optional_hits) * 0.05
+
+def _score_with_tokens(
+    resume: Resume, job: JobListing, desc_tokens: AbstractSet[str], prefs: UserPreferences
+) -> MatchResult:
     title_match = any(target.lower() in job.title.lower() for target in prefs.target_titles)
-    title_score = 0.15 if title_match else 0.0
     location_match = any(loc.lower() in job.location.lower() for loc in prefs.target_locations)
-    location_score = 0.1 if location_match else 0.0
-    skill_score = len(skill_hits) * 0.03
+    score, breakdown = _score_fields(resume, desc_tokens, title_match, location_match, prefs)
+    return MatchResult(job=job, score=score, breakdown=breakdown)
 
-    score = required_score * 0.55 + optional_score + title_score + location_score + skill_score
-    score = max(0.0, min(score, 1.0))
+
+def _score_fields(
+    resume: Resume, desc_tokens: AbstractSet[str], title_match: bool, location_match: bool, prefs: UserPreferences
+) -> Tuple[float, MatchBreakdown]:
+    skill_hits = [skill for skill in resume.skills if skill in desc_tokens]
+    required_hits = [skill for skill in prefs.required_skills if skill in desc_tokens]
+    optional_hits = [skill for skill in prefs.optional_skills if skill in desc_tokens]
+
+    score = _combine_score(
+        len(required_hits), len(prefs.required_skills), len(optional_hits), len(skill_hits), title_match, location_match
+    )
 
     breakdown = MatchBreakdown(
         skill_overlap=skill_hits,
@@ -38,7 +346,83 @@ def score_job(resume: Resume, job: JobListing, prefs: UserPreferences) -> MatchR
         title_match=title_match,
         keyword_hits=required_hits + optional_hits,
     )
-    return MatchResult(job=job, score=score, breakdown=breakdown)
+    return score, breakdown
+
+
+def _score_indexed(resume: Resume, index: JobIndex, prefs: UserPreferences) -> List[MatchResult]:
+    skill_hits = _collect_hits(index, resume.skills)
+    required_hits = _collect_hits(index, prefs.required_skills)
+    optional_hits = _collect_hits(index, prefs.optional_skills)
+    title_matches = index.matching_titles(prefs.target_titles)
+    location_matches = index.matching_locations(prefs.target_locations)
+
+    results: List[MatchResult] = []
+    for position in range(len(index)):
+        job = index.jobs[position]
+        skills = skill_hits.get(position, [])
+        required = required_hits.get(position, [])
+        optional = optional_hits.get(position, [])
+        title_match = position in title_matches
+        location_match = position in location_matches
+        score = _combine_score(
+            len(required), len(prefs.required_skills), len(optional), len(skills), title_match, location_match
+        )
+        breakdown = MatchBreakdown(
+            skill_overlap=list(skills),
+            location_match=location_match,
+            title_match=title_match,
+            keyword_hits=required + optional,
+        )
+        results.append(MatchResult(job=job, score=score, breakdown=breakdown))
+    results.sort(key=lambda m: m.score, reverse=True)
+    return results
+
+
+def _combine_score(
+    required_hits: int,
+    required_total: int,
+    optional_hits: int,
+    skill_hits: int,
+    title_match: bool,
+    location_match: bool,
+) -> float:
+    required_score = required_hits / max(required_total, 1)
+    optional_score = optional_hits * 0.05
+    title_score = 0.15 if title_match else 0.0
+    location_score = 0.1 if location_match else 0.0
+    skill_score = skill_hits * 0.03
+
+    score = required_score * 0.55 + optional_score + title_score + location_score + skill_score
+    return max(0.0, min(score, 1.0))
+
+
+def _collect_hits(index: JobIndex, skills: Iterable[str]) -> Dict[int, List[str]]:
+    hits: Dict[int, List[str]] = defaultdict(list)
+    for skill in skills:
+        for position in index.postings.get(skill, ()):
+            hits[position].append(skill)
+    return hits
+
+
+def _match_values(values: Dict[str, List[int]], targets: Iterable[str]) -> Set[int]:
+    lowered = [target.lower() for target in targets]
+    positions: Set[int] = set()
+    for value, ids in values.items():
+        if any(target in value for target in lowered):
+            positions.update(ids)
+    return positions
+
+
+def _description_tokens(job: JobListing, cache: Optional["FeatureCache"]) -> AbstractSet[str]:
+    if cache is not None:
+        return cache.description_tokens(job)
+    return _tokenize(job.description)
+
+
+def _batch_tokens(jobs: JobBatch) -> Iterable[AbstractSet[str]]:
+    if jobs.tokens is not None:
+        return jobs.tokens
+    return map(_tokenize, jobs.descriptions)
 
 
 def _tokenize(text: str) -> Set[str]:
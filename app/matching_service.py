@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import DEFAULT_CONFIG_PATH, load_preferences
+from .hashing import bytes_hash
+from .corpus import CorpusScraper
+from .job_filter import JobFilter
+from .job_scraper import JSON_LINES_SUFFIXES, job_from_raw, scraper_for_path
+from .job_store import JobBatch
+from .matching import JobIndex, top_k_matches
+from .metrics import metrics
+from .models import JobListing, MatchResult, Resume, UserPreferences
+from .resume_cache import ResumeCache
+from .resume_parser import DEFAULT_KNOWN_SKILLS, parse_resume
+
+
+_TAIL_BYTES = 4096
+
+
+@dataclass
+class Profile:
+    profile_id: str
+    resume: Resume
+    prefs: UserPreferences
+
+
+@dataclass
+class _Source:
+    path: Path
+    jobs: JobBatch  # grows as JSON Lines appends arrive; each index covers a fixed prefix of it
+    index: JobIndex
+    mtime_ns: int
+    size: int
+    inode: int
+    offset: int = 0  # bytes of a JSON Lines file already indexed
+    tail: Optional[bytes] = None  # the last indexed bytes of a JSON Lines file, to tell an append from a rewrite
+
+
+class MatchingService:
+    def __init__(
+        self,
+        sources: Sequence[Path],
+        config_path: Path = DEFAULT_CONFIG_PATH,
+        resume_cache: Optional[ResumeCache] = None,
+        reload_interval: float = 2.0,
+        max_profiles: int = 10_000,
+        max_resumes: int = 1_000,
+    ) -> None:
+        self.config_path = config_path
+        self.resume_cache = resume_cache
+        self.reload_interval = reload_interval
+        self.max_profiles = max_profiles
+        self.max_resumes = max_resumes
+        self.reloads = 0
+        self.appends = 0
+        self.skipped_lines = 0
+        self._lock = threading.Lock()
+        self._sources: Dict[Path, _Source] = {}
+        self._order = [Path(path) for path in sources]
+        self._prefs: Optional[Tuple[int, UserPreferences]] = None
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._resumes: "OrderedDict[Tuple[str, Tuple[str, ...]], Resume]" = OrderedDict()
+        self._stop = threading.Event()
+        for path in self._order:
+            self._sources[path] = self._load(path)
+        self._watcher: Optional[threading.Thread] = None
+        if reload_interval > 0:
+            self._watcher = threading.Thread(target=self._watch, name="matching-service-reload", daemon=True)
+            self._watcher.start()
+
+    def preferences(self) -> UserPreferences:
+        mtime = self.config_path.stat().st_mtime_ns
+        cached = self._prefs
+        if cached is None or cached[0] != mtime:
+            cached = self._prefs = (mtime, load_preferences(self.config_path))
+        # callers customise preferences per request, so never hand out the shared copy
+        return copy.deepcopy(cached[1])
+
+    def known_skills(self, prefs: UserPreferences) -> List[str]:
+        return sorted({*DEFAULT_KNOWN_SKILLS, *prefs.required_skills, *prefs.optional_skills})
+
+    def parse_resume(self, path: Path, known_skills: Iterable[str]) -> Resume:
+        skills = tuple(sorted({skill.lower() for skill in known_skills}))
+        key = (bytes_hash(path.read_bytes()), skills)
+        with self._lock:
+            resume = self._resumes.get(key)
+            if resume is not None:
+                self._resumes.move_to_end(key)
+                return resume
+        resume = parse_resume(path, skills, cache=self.resume_cache)
+        with self._lock:
+            self._resumes[key] = resume
+            while len(self._resumes) > self.max_resumes:
+                self._resumes.popitem(last=False)
+        return resume
+
+    def add_profile(self, resume: Resume, prefs: UserPreferences) -> str:
+        payload = json.dumps({"resume": asdict(resume), "prefs": asdict(prefs)}, sort_keys=True)
+        profile_id = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            self._profiles[profile_id] = Profile(profile_id, resume, prefs)
+            self._profiles.move_to_end(profile_id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def profile(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def score(
+        self, resume: Resume, prefs: UserPreferences, k: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[MatchResult]:
+        # indexes are never mutated once published, so score a snapshot without holding the lock
+        with self._lock:
+            indexes = [self._sources[path].index for path in self._order]
+        # hard filters drop rows here just as the scrapers would have, so every entry point agrees
+        job_filter = JobFilter.for_preferences(prefs)
+        with metrics.stage("service_score") as stage:
+            # each source keeps its own index; merging per-source top-k lists in source
+            # order gives the same ranking and tie order as one index over all sources
+            matches: List[MatchResult] = []
+            for index in indexes:
+                allowed = None if job_filter is None else set(job_filter.positions(index.jobs, len(index)))
+                matches.extend(top_k_matches(resume, index, prefs, k=k, min_score=min_score, allowed=allowed))
+            stage.items = sum(len(index) for index in indexes)
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return matches if k is None else matches[:k]
+
+    def score_profiles(
+        self, profile_ids: Iterable[str], k: Optional[int] = None, min_score: Optional[float] = None
+    ) -> Dict[str, Optional[List[MatchResult]]]:
+        results: Dict[str, Optional[List[MatchResult]]] = {}
+        for profile_id in profile_ids:
+            profile = self.profile(profile_id)
+            results[profile_id] = None if profile is None else self.score(profile.resume, profile.prefs, k, min_score)
+        return results
+
+    def refresh(self) -> bool:
+        changed = False
+        for path in self._order:
+            current = self._sources[path]
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime_ns == current.mtime_ns and stat.st_size == current.size:
+                continue
+            changed = True
+            if self._appended(current, stat):
+                self._append(current, stat)
+            else:
+                # rebuilt off-lock; requests keep scoring against the old index until the swap
+                replacement = self._load(path)
+                with self._lock:
+                    self._sources[path] = replacement
+                    self.reloads += 1
+        return changed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "jobs": sum(len(source.index) for source in self._sources.values()),
+                "sources": len(self._sources),
+                "profiles": len(self._profiles),
+                "resumes": len(self._resumes),
+                "reloads": self.reloads,
+                "appends": self.appends,
+                "skipped_lines": self.skipped_lines,
+            }
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def _load(self, path: Path) -> _Source:
+        stat = path.stat()
+        if path.suffix.lower() in JSON_LINES_SUFFIXES:
+            jobs = JobBatch()
+            source = _Source(path, jobs, JobIndex(jobs), 0, 0, stat.st_ino, tail=b"")
+            self._read_appended(source, stat)
+            return source
+        scraper = scraper_for_path(path)
+        jobs = scraper.corpus if isinstance(scraper, CorpusScraper) else JobBatch.from_jobs(scraper.iter_jobs([], []))
+        return _Source(path, jobs, JobIndex(jobs), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _appended(self, source: _Source, stat: os.stat_result) -> bool:
+        # only a JSON Lines file that grew in place with its indexed bytes untouched is an append;
+        # anything replaced, truncated or rewritten is reloaded from scratch
+        if source.tail is None or stat.st_ino != source.inode or stat.st_size <= source.size:
+            return False
+        with source.path.open("rb") as fh:
+            fh.seek(source.offset - len(source.tail))
+            return fh.read(len(source.tail)) == source.tail
+
+    def _append(self, source: _Source, stat: os.stat_result) -> None:
+        if self._read_appended(source, stat):
+            with self._lock:
+                self.appends += 1
+
+    def _read_appended(self, source: _Source, stat: os.stat_result) -> int:
+        # JSON Lines sources are append-only: index just the complete lines written since the last poll
+        with source.path.open("rb") as fh:
+            fh.seek(source.offset)
+            chunk = fh.read(stat.st_size - source.offset)
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        jobs: List[JobListing] = []
+        skipped = 0
+        # split on "\n" only: JSON strings may hold raw U+2028, U+0085 and friends, which str.splitlines breaks on
+        for line in complete.split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                jobs.append(job_from_raw(json.loads(line)))
+            except (ValueError, TypeError, AttributeError):
+                # one bad row must not block every append after it
+                skipped += 1
+        if skipped:
+            metrics.inc("jobs_skipped_total", skipped, source=source.path.name)
+            print(f"Matching service skipped {skipped} malformed line(s) in {source.path}")
+        # a published index only reads its own prefix of ``source.jobs``, so rows are appended and
+        # the next index is built (copy-on-write) while requests keep scoring the current one
+        source.jobs.extend(jobs)
+        index = source.index.extended(source.jobs)
+        tail = (source.tail + complete)[-_TAIL_BYTES:]
+        with self._lock:
+            source.index = index
+            source.offset += len(complete)
+            source.mtime_ns = stat.st_mtime_ns
+            source.size = source.offset
+            source.tail = tail
+            self.skipped_lines += skipped
+        return len(jobs)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.refresh()
+            except Exception as exc:  # noqa: BLE001 - a bad write must not kill the watcher
+                print(f"Matching service reload failed: {exc}")
+
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import bisect
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "min": round(self.minimum, 6) if self.count else None,
+            "max": round(self.maximum, 6),
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class _Stage:
+    __slots__ = ("_metrics", "_name", "_started", "items")
+
+    def __init__(self, metrics: "Metrics", name: str) -> None:
+        self._metrics = metrics
+        self._name = name
+        self.items = 0
+
+    def __enter__(self) -> "_Stage":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._started
+        self._metrics.observe("stage_seconds", elapsed, stage=self._name)
+        if self.items:
+            self._metrics.inc("stage_items_total", self.items, stage=self._name)
+
+
+class _NullStage:
+    __slots__ = ("items",)
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Metrics:
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def stage(self, name: str) -> Any:
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def track(self, name: str, collector: Callable[[], Dict[str, float]]) -> None:
+        # gauges read at snapshot time, e.g. a cache's stats(), so the hot path pays nothing
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [{"labels": dict(key), **histogram.to_dict()} for key, histogram in series.items()]
+                for name, series in self._histograms.items()
+            }
+            collectors = dict(self._collectors)
+        gauges = {name: collector() for name, collector in collectors.items()}
+        return {"enabled": self.enabled, "counters": counters, "histograms": histograms, "gauges": gauges}
+
+    def stage_summary(self) -> List[Dict[str, Any]]:
+        snapshot = self.snapshot()
+        items = {
+            row["labels"].get("stage"): row["value"] for row in snapshot["counters"].get("stage_items_total", [])
+        }
+        rows = []
+        for row in snapshot["histograms"].get("stage_seconds", []):
+            stage = row["labels"].get("stage")
+            processed = items.get(stage, 0)
+            rows.append(
+                {
+                    "stage": stage,
+                    "calls": row["count"],
+                    "seconds": row["sum"],
+                    "max_seconds": row["max"],
+                    "items": int(processed),
+                    "items_per_second": round(processed / row["sum"], 2) if processed and row["sum"] else None,
+                }
+            )
+        rows.sort(key=lambda row: row["seconds"], reverse=True)
+        return rows
+
+    def report(self) -> str:
+        lines = ["Stage timings:"]
+        for row in self.stage_summary():
+            rate = f"{row['items_per_second']:>12,.0f}/s" if row["items_per_second"] else " " * 14
+            lines.append(
+                f"  {row['stage']:<26} {row['seconds']:>9.3f}s  calls={row['calls']:<6} max={row['max_seconds']:.4f}s {rate}"
+            )
+        snapshot = self.snapshot()
+        for name, rows in sorted(snapshot["histograms"].items()):
+            if name == "stage_seconds":
+                continue
+            for row in rows:
+                lines.append(
+                    f"  {name}{_label_text(row['labels'])}: count={row['count']} sum={row['sum']:.3f}s max={row['max']:.4f}s"
+                )
+        for name, rows in sorted(snapshot["counters"].items()):
+            if name == "stage_items_total":
+                continue
+            for row in rows:
+                lines.append(f"  {name}{_label_text(row['labels'])}: {row['value']:g}")
+        for name, values in sorted(snapshot["gauges"].items()):
+            lines.append(f"  {name}: " + ", ".join(f"{key}={value}" for key, value in values.items()))
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps({"stages": self.stage_summary(), **self.snapshot()}, indent=2)
+
+    def to_prometheus(self, prefix: str = "jobapp_") -> str:
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for name, rows in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {prefix}{name} counter")
+            for row in rows:
+                lines.append(f"{prefix}{name}{_prom_labels(row['labels'])} {row['value']:g}")
+        for name, rows in sorted(snapshot["histograms"].items()):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for row in rows:
+                cumulative = 0
+                for bound, count in row["buckets"].items():
+                    cumulative += count
+                    lines.append(f"{prefix}{name}_bucket{_prom_labels({**row['labels'], 'le': bound})} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{_prom_labels(row['labels'])} {row['sum']}")
+                lines.append(f"{prefix}{name}_count{_prom_labels(row['labels'])} {row['count']}")
+        for name, values in sorted(snapshot["gauges"].items()):
+            for key, value in sorted(values.items()):
+                lines.append(f"# TYPE {prefix}{name}_{key} gauge")
+                lines.append(f"{prefix}{name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def profiled(output: Optional[Path] = None, top: int = 25) -> Iterator[Optional[cProfile.Profile]]:
+    if output is None:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(output))
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(top)
+        print(buffer.getvalue())
+        print(f"cProfile stats written to {output} (open with `python -m pstats {output}`)")
+
+
+def _label_text(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ", ".join(f"{key}={value}" for key, value in sorted(labels.items())) + "}"
+
+
+def _prom_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels.keys(), escaped)) + "}"
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -17,20 +17,50 @@ class Resume:
     projects: List[str] = field(default_factory=list)
 
 
-@dataclass
 class JobListing:
-    id: str
-    title: str
-    company: str
-    location: str
-    description: str
-    platform: str = "mock"
-    url: Optional[str] = None
-    metadata: Dict[str, str] = field(default_factory=dict)
+    # slotted by hand rather than @dataclass(slots=True), which needs Python 3.10;
+    # slots cannot coexist with class-level field defaults, so __init__ carries them
+    __slots__ = ("id", "title", "company", "location", "description", "platform", "url", "metadata")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        company: str,
+        location: str,
+        description: str,
+        platform: str = "mock",
+        url: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.company = company
+        self.location = location
+        self.description = description
+        self.platform = platform
+        self.url = url
+        self.metadata = {} if metadata is None else metadata
+
+    def _fields(self) -> Tuple[object, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()  # type: ignore[attr-defined]
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
 
 
 @dataclass
 class MatchBreakdown:
+    __slots__ = ("skill_overlap", "location_match", "title_match", "keyword_hits")
+
     skill_overlap: List[str]
     location_match: bool
     title_match: bool
@@ -39,6 +69,8 @@ class MatchBreakdown:
 
 @dataclass
 class MatchResult:
+    __slots__ = ("job", "score", "breakdown")
+
     job: JobListing
     score: float
     breakdown: MatchBreakdown
@@ -62,5 +94,7 @@ class UserPreferences:
     required_skills: List[str] = field(default_factory=list)
     optional_skills: List[str] = field(default_factory=list)
     throttle_seconds: float = 2.0
+    platform_throttle_seconds: Dict[str, float] = field(default_factory=dict)
     review_mode: bool = False
     min_score: float = 0.45
+    hard_filters: List[str] = field(default_factory=list)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .hashing import vocabulary_hash
+from .models import Resume
+
+
+DEFAULT_RESUME_CACHE_DIR = Path("logs/resume_cache")
+
+
+class ResumeCache:
+    def __init__(self, root: Path = DEFAULT_RESUME_CACHE_DIR, max_entries: int = 512) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        (self.root / "text").mkdir(parents=True, exist_ok=True)
+        (self.root / "resumes").mkdir(parents=True, exist_ok=True)
+
+    def get_resume(self, file_hash: str, known_skills: Iterable[str]) -> Optional[Resume]:
+        path = self._resume_path(file_hash, known_skills)
+        raw = self._read(path)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return Resume(**json.loads(raw))
+
+    def put_resume(self, file_hash: str, known_skills: Iterable[str], resume: Resume) -> None:
+        self._write(self._resume_path(file_hash, known_skills), json.dumps(asdict(resume)))
+
+    def get_text(self, file_hash: str) -> Optional[str]:
+        return self._read(self.root / "text" / f"{file_hash}.txt")
+
+    def put_text(self, file_hash: str, text: str) -> None:
+        self._write(self.root / "text" / f"{file_hash}.txt", text)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _resume_path(self, file_hash: str, known_skills: Iterable[str]) -> Path:
+        return self.root / "resumes" / f"{file_hash}-{vocabulary_hash(known_skills)[:16]}.json"
+
+    def _read(self, path: Path) -> Optional[str]:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mtime doubles as the LRU clock for eviction
+        except OSError:
+            pass
+        return text
+
+    def _write(self, path: Path, payload: str) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+        os.replace(tmp_name, path)
+        self._evict(path.parent)
+
+    def _evict(self, directory: Path) -> None:
+        entries = [entry for entry in os.scandir(directory) if entry.is_file() and not entry.name.endswith(".tmp")]
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:overflow]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
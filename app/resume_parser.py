@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import importlib
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from types import ModuleType
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
+from .hashing import bytes_hash
+from .metrics import metrics
 from .models import Resume
+from .skill_matcher import get_skill_matcher
+
+if TYPE_CHECKING:
+    from .resume_cache import ResumeCache
 
 
 DEFAULT_KNOWN_SKILLS = [
@@ -53,8 +62,27 @@ def extract_text_from_file(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def parse_resume(path: Path, known_skills: Iterable[str]) -> Resume:
-    text = extract_text_from_file(path)
+def parse_resume(path: Path, known_skills: Iterable[str], cache: Optional["ResumeCache"] = None) -> Resume:
+    with metrics.stage("parse_resume") as stage:
+        stage.items = 1
+        normalized_skills = [s.lower() for s in known_skills]
+        if cache is None:
+            return parse_resume_text(extract_text_from_file(path), normalized_skills)
+
+        file_hash = bytes_hash(path.read_bytes())
+        resume = cache.get_resume(file_hash, normalized_skills)
+        if resume is not None:
+            return resume
+        text = cache.get_text(file_hash)
+        if text is None:
+            text = extract_text_from_file(path)
+            cache.put_text(file_hash, text)
+        resume = parse_resume_text(text, normalized_skills)
+        cache.put_resume(file_hash, normalized_skills, resume)
+        return resume
+
+
+def parse_resume_text(text: str, known_skills: Iterable[str]) -> Resume:
     normalized_skills = [s.lower() for s in known_skills]
     skills = sorted(set(_extract_skills(text, normalized_skills)))
     name, email, phone = _extract_contact(text)
@@ -75,12 +103,7 @@ def parse_resume(path: Path, known_skills: Iterable[str]) -> Resume:
 
 
 def _extract_skills(text: str, known_skills: Iterable[str]) -> List[str]:
-    lowered = text.lower()
-    hits = []
-    for skill in known_skills:
-        if skill and skill in lowered:
-            hits.append(skill)
-    return hits
+    return get_skill_matcher(known_skills).find(text)
 
 
 def _extract_contact(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
@@ -113,11 +136,19 @@ def _extract_section_lines(text: str, keywords: List[str], max_lines: int) -> Li
     return collected
 
 
-def _extract_pdf(path: Path) -> Optional[str]:
+@lru_cache(maxsize=None)
+def _load_backend(module_name: str) -> Optional[ModuleType]:
+    # optional extractors are imported on first use only, and a missing one is not retried
     try:
-        import PyPDF2  # type: ignore
+        return importlib.import_module(module_name)
     except Exception:
         return None
+
+
+def _extract_pdf(path: Path) -> Optional[str]:
+    PyPDF2 = _load_backend("PyPDF2")
+    if PyPDF2 is None:
+        return None
     try:
         reader = PyPDF2.PdfReader(str(path))
         return "\\n".join(page.extract_text() or "" for page in reader.pages)
@@ -126,9 +157,8 @@ def _extract_pdf(path: Path) -> Optional[str]:
 
 
 def _extract_docx(path: Path) -> Optional[str]:
-    try:
-        import docx  # type: ignore
-    except Exception:
+    docx = _load_backend("docx")
+    if docx is None:
         return None
     try:
         document = docx.Document(str(path))
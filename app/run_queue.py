@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_RUNS_PATH = Path("logs/runs.sqlite")
+
+ProgressCallback = Callable[..., None]
+RunHandler = Callable[[ProgressCallback], Dict[str, Any]]
+
+
+class RunQueue:
+    def __init__(self, db_path: Path = DEFAULT_RUNS_PATH, workers: int = 2, history: int = 100) -> None:
+        self.db_path = db_path
+        self.history = history
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[str, RunHandler]]" = queue.Queue()
+        self._init_db()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"run-worker-{index}", daemon=True) for index in range(max(workers, 1))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _init_db(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    id TEXT PRIMARY KEY,
+                    action TEXT,
+                    status TEXT,
+                    progress TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT,
+                    updated_at TEXT
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at)")
+            # handlers live in memory, so work cut off by a restart cannot be resumed
+            self._conn.execute(
+                "UPDATE runs SET status = 'failed', error = 'interrupted by server restart', updated_at = ? "
+                "WHERE status IN ('queued', 'running')",
+                (_now(),),
+            )
+
+    def submit(self, action: str, handler: RunHandler) -> str:
+        run_id = uuid.uuid4().hex[:12]
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (id, action, status, progress, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (run_id, action, json.dumps({"stage": "queued"}), now, now),
+            )
+            self._prune()
+        self._queue.put((run_id, handler))
+        return run_id
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, action, status, progress, result, error, created_at, updated_at FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+        return _row_to_run(row) if row else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, action, status, progress, result, error, created_at, updated_at FROM runs "
+                "ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_row_to_run(row, include_result=False) for row in rows]
+
+    def _work(self) -> None:
+        while True:
+            run_id, handler = self._queue.get()
+            self._update(run_id, status="running", progress={"stage": "starting"})
+
+            def progress(stage: str, **details: Any) -> None:
+                self._update(run_id, progress={"stage": stage, **details})
+
+            try:
+                result = handler(progress)
+            except Exception as exc:  # noqa: BLE001 - surfaced to the client through the run record
+                self._update(run_id, status="failed", error=f"{type(exc).__name__}: {exc}", progress={"stage": "failed"})
+            else:
+                self._update(run_id, status="done", result=result, progress={"stage": "done"})
+            finally:
+                self._queue.task_done()
+
+    def _update(
+        self,
+        run_id: str,
+        status: Optional[str] = None,
+        progress: Optional[Dict[str, Any]] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        assignments = ["updated_at = ?"]
+        params: List[Any] = [_now()]
+        for column, value in (
+            ("status", status),
+            ("progress", json.dumps(progress) if progress is not None else None),
+            ("result", json.dumps(result) if result is not None else None),
+            ("error", error),
+        ):
+            if value is not None:
+                assignments.append(f"{column} = ?")
+                params.append(value)
+        params.append(run_id)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE runs SET {', '.join(assignments)} WHERE id = ?", params)
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM runs WHERE status IN ('done', 'failed') AND id NOT IN "
+            "(SELECT id FROM runs ORDER BY created_at DESC LIMIT ?)",
+            (self.history,),
+        )
+
+
+def _row_to_run(row: Tuple[Any, ...], include_result: bool = True) -> Dict[str, Any]:
+    run_id, action, status, progress, result, error, created_at, updated_at = row
+    run: Dict[str, Any] = {
+        "id": run_id,
+        "action": action,
+        "status": status,
+        "progress": json.loads(progress) if progress else {},
+        "error": error,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+    if include_result:
+        run["result"] = json.loads(result) if result else None
+    return run
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from .metrics import metrics
+from .models import MatchResult
+
+
+P = TypeVar("P")
+R = TypeVar("R")
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_interval(cls, seconds: float, burst: float = 1.0) -> "TokenBucket":
+        return cls(rate=1.0 / seconds if seconds > 0 else 0.0, capacity=burst)
+
+    def acquire(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class SubmissionScheduler(Generic[P, R]):
+    def __init__(
+        self,
+        default_interval: float,
+        platform_intervals: Optional[Dict[str, float]] = None,
+        prepare_workers: int = 4,
+    ) -> None:
+        self.default_interval = default_interval
+        self.platform_intervals = platform_intervals or {}
+        self.prepare_workers = max(prepare_workers, 1)
+        self.waited: Dict[str, float] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, platform: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(platform)
+            if bucket is None:
+                interval = self.platform_intervals.get(platform, self.default_interval)
+                bucket = TokenBucket.from_interval(max(interval, 0))
+                self._buckets[platform] = bucket
+            return bucket
+
+    def run(
+        self,
+        matches: Sequence[MatchResult],
+        prepare: Callable[[MatchResult], P],
+        submit: Callable[[MatchResult, P], Optional[R]],
+    ) -> List[R]:
+        if not matches:
+            return []
+
+        by_platform: "OrderedDict[str, List[Tuple[int, MatchResult, Future]]]" = OrderedDict()
+        results: Dict[int, R] = {}
+        errors: List[BaseException] = []
+
+        with ThreadPoolExecutor(max_workers=self.prepare_workers) as pool:
+            for position, match in enumerate(matches):
+                future = pool.submit(prepare, match)
+                by_platform.setdefault(match.job.platform, []).append((position, match, future))
+
+            def drain(platform: str, queue: List[Tuple[int, MatchResult, Future]]) -> None:
+                bucket = self.bucket(platform)
+                try:
+                    for position, match, future in queue:
+                        prepared = future.result()
+                        waited = bucket.acquire()
+                        with self._lock:
+                            self.waited[platform] = self.waited.get(platform, 0.0) + waited
+                        metrics.observe("throttle_wait_seconds", waited, platform=platform)
+                        result = submit(match, prepared)
+                        if result is not None:
+                            results[position] = result
+                except BaseException as exc:  # noqa: BLE001 - re-raised on the calling thread
+                    errors.append(exc)
+
+            workers = [
+                threading.Thread(target=drain, args=(platform, queue), name=f"submit-{platform}", daemon=True)
+                for platform, queue in by_platform.items()
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+        return [results[position] for position in sorted(results)]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .hashing import job_content_hash
+from .models import JobListing, Resume, UserPreferences
+
+
+DEFAULT_SEEN_JOBS_PATH = Path("logs/seen_jobs.sqlite")
+_LOOKUP_BATCH = 400  # two bound parameters per key plus the profile; stays under SQLite's 999 limit
+
+
+class SeenJobStore:
+    # ``profile`` (see profile_hash) scopes what "seen" means: a listing processed for one resume
+    # and set of preferences is new again once either changes
+    def __init__(self, db_path: Path = DEFAULT_SEEN_JOBS_PATH, profile: str = "") -> None:
+        self.db_path = db_path
+        self.profile = profile
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version < 1:
+                # the unversioned table was keyed on (platform, job_id) alone and cannot say which
+                # profile processed a listing, so it is replaced; applied jobs stay guarded by the
+                # application log
+                conn.execute("DROP TABLE IF EXISTS seen_jobs")
+                conn.execute(
+                    """
+                    CREATE TABLE seen_jobs (
+                        profile_hash TEXT NOT NULL,
+                        platform TEXT NOT NULL,
+                        job_id TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        first_seen TEXT NOT NULL,
+                        last_seen TEXT NOT NULL,
+                        PRIMARY KEY (profile_hash, platform, job_id)
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX idx_seen_jobs_last_seen ON seen_jobs (last_seen)")
+                conn.execute("PRAGMA user_version = 1")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def filter_new(self, jobs: Iterable[JobListing]) -> List[JobListing]:
+        # read-only: a listing only becomes "seen" once mark_seen records that it was fully processed
+        jobs = list(jobs)
+        with sqlite3.connect(self.db_path) as conn:
+            known = self._known_hashes(conn, [(job.platform, job.id) for job in jobs])
+        fresh: List[JobListing] = []
+        for job in jobs:
+            content_hash = job_content_hash(job)
+            if known.get((job.platform, job.id)) != content_hash:
+                fresh.append(job)
+                known[(job.platform, job.id)] = content_hash
+        return fresh
+
+    def mark_seen(self, jobs: Iterable[JobListing]) -> None:
+        now = datetime.utcnow().isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO seen_jobs (profile_hash, platform, job_id, content_hash, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (profile_hash, platform, job_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen
+                """,
+                [(self.profile, job.platform, job.id, job_content_hash(job), now, now) for job in jobs],
+            )
+
+    def count(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            (total,) = conn.execute("SELECT COUNT(*) FROM seen_jobs WHERE profile_hash = ?", (self.profile,)).fetchone()
+        return total
+
+    def _known_hashes(self, conn: sqlite3.Connection, keys: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        known: Dict[Tuple[str, str], str] = {}
+        for start in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[start : start + _LOOKUP_BATCH]
+            placeholders = ", ".join("(?, ?)" for _ in batch)
+            params = [self.profile, *(value for key in batch for value in key)]
+            rows = conn.execute(
+                "SELECT platform, job_id, content_hash FROM seen_jobs "
+                f"WHERE profile_hash = ? AND (platform, job_id) IN (VALUES {placeholders})",
+                params,
+            )
+            for platform, job_id, content_hash in rows:
+                known[(platform, job_id)] = content_hash
+        return known
+
+
+def profile_hash(resume: Resume, prefs: UserPreferences) -> str:
+    payload = json.dumps({"resume": asdict(resume), "prefs": asdict(prefs)}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import heapq
+import math
+import random
+import re
+import sqlite3
+import time
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .hashing import content_hash
+from .job_store import JobBatch
+from .matching import top_k_matches
+from .metrics import metrics
+from .models import JobListing, MatchResult, Resume, UserPreferences
+
+if TYPE_CHECKING:
+    from .feature_cache import FeatureCache
+
+# Semantic candidate retrieval, fully offline. Jobs and the resume are embedded
+# as sparse hashed TF-IDF vectors (signed feature hashing, sublinear tf, idf fitted
+# on the corpus) and stored in an IVF index: a spherical k-means coarse quantizer
+# whose centroids are truncated to their heaviest terms, plus one inverted list of
+# job positions per centroid. A query only scores the jobs in its nearest lists,
+# and the keyword scorer then reranks those few thousand candidates.
+#
+# The model (idf table + centroids) and every job vector, keyed by job content
+# hash, persist in SQLite, so later runs embed only listings they have not seen.
+
+DEFAULT_INDEX_PATH = Path("logs/semantic_index.sqlite")
+DEFAULT_DIM = 1 << 15
+MODEL_VERSION = 1
+_TERM_RE = re.compile(r"[a-z][a-z0-9+#.]*")
+_LOOKUP_BATCH = 500
+_ASSIGN_TERMS = 16
+
+# (bucket ids, weights), sorted by bucket and L2-normalised
+Vector = Tuple[array, array]
+
+
+class HashedEmbedder:
+    def __init__(self, dim: int = DEFAULT_DIM, idf: Optional[array] = None) -> None:
+        self.dim = dim
+        self.idf = array("f", [1.0]) * dim if idf is None else idf
+
+    @classmethod
+    def fit(cls, documents: Iterable[Iterable[str]], dim: int = DEFAULT_DIM) -> "HashedEmbedder":
+        frequencies = array("I", [0]) * dim
+        count = 0
+        for terms in documents:
+            count += 1
+            for bucket in {zlib.crc32(term.encode("utf-8")) % dim for term in terms}:
+                frequencies[bucket] += 1
+        idf = array("f", (math.log((1 + count) / (1 + frequency)) + 1.0 for frequency in frequencies))
+        return cls(dim, idf)
+
+    def embed(self, terms: Iterable[str]) -> Vector:
+        dim = self.dim
+        idf = self.idf
+        weights: Dict[int, float] = {}
+        for term, count in Counter(terms).items():
+            hashed = zlib.crc32(term.encode("utf-8"))
+            bucket = hashed % dim
+            # the top hash bit picks the sign so colliding terms tend to cancel rather than add up
+            weight = (1.0 + math.log(count)) * idf[bucket]
+            weights[bucket] = weights.get(bucket, 0.0) + (-weight if hashed & 0x80000000 else weight)
+        return _vector(weights)
+
+
+class IVFIndex:
+    def __init__(self, centroids: List[Vector]) -> None:
+        self.centroids = centroids
+        self.lists: List[array] = [array("I") for _ in centroids]
+        self._postings: Dict[int, List[Tuple[int, float]]] = {}
+        for centroid_id, (buckets, weights) in enumerate(centroids):
+            for bucket, weight in zip(buckets, weights):
+                self._postings.setdefault(bucket, []).append((centroid_id, weight))
+
+    @classmethod
+    def train(
+        cls, vectors: Sequence[Vector], nlist: int, iterations: int = 4, seed: int = 7, centroid_terms: int = 256
+    ) -> "IVFIndex":
+        rng = random.Random(seed)
+        centroids = [vectors[position] for position in rng.sample(range(len(vectors)), min(nlist, len(vectors)))]
+        for _ in range(iterations):
+            quantizer = cls(centroids)
+            sums: List[Dict[int, float]] = [{} for _ in centroids]
+            for vector in vectors:
+                target = sums[quantizer.assign(vector)]
+                for bucket, weight in zip(*vector):
+                    target[bucket] = target.get(bucket, 0.0) + weight
+            # empty clusters keep their previous centroid
+            centroids = [
+                _vector(dict(heapq.nlargest(centroid_terms, total.items(), key=lambda item: abs(item[1]))))
+                if total
+                else previous
+                for total, previous in zip(sums, centroids)
+            ]
+        return cls(centroids)
+
+    def similarities(self, vector: Vector) -> List[float]:
+        scores = [0.0] * len(self.centroids)
+        postings = self._postings
+        for bucket, weight in zip(*vector):
+            for centroid_id, centroid_weight in postings.get(bucket, ()):
+                scores[centroid_id] += weight * centroid_weight
+        return scores
+
+    def assign(self, vector: Vector) -> int:
+        # a vector's heaviest terms are enough to pick its list and keep building linear in corpus size
+        if len(vector[0]) > _ASSIGN_TERMS:
+            heaviest = heapq.nlargest(_ASSIGN_TERMS, zip(*vector), key=lambda item: abs(item[1]))
+            vector = (array("I", (bucket for bucket, _ in heaviest)), array("f", (weight for _, weight in heaviest)))
+        scores = self.similarities(vector)
+        return max(range(len(scores)), key=scores.__getitem__)
+
+    def add(self, position: int, list_id: int) -> None:
+        self.lists[list_id].append(position)
+
+
+class SemanticStore:
+    def __init__(self, db_path: Path = DEFAULT_INDEX_PATH) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS semantic_model (key TEXT PRIMARY KEY, value BLOB)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_vectors (
+                    content_hash TEXT PRIMARY KEY,
+                    buckets BLOB NOT NULL,
+                    weights BLOB NOT NULL,
+                    list_id INTEGER NOT NULL
+                )
+                """
+            )
+
+    def load_model(self) -> Optional[Tuple[HashedEmbedder, IVFIndex]]:
+        model = dict(self._conn.execute("SELECT key, value FROM semantic_model"))
+        if not model or int(model.get("version", 0)) != MODEL_VERSION:
+            return None
+        dim = int(model["dim"])
+        centroid_count = int(model["nlist"])
+        centroids = [
+            _unpack(model[f"centroid.{index}.b"], model[f"centroid.{index}.w"]) for index in range(centroid_count)
+        ]
+        return HashedEmbedder(dim, _unpack_array("f", model["idf"])), IVFIndex(centroids)
+
+    def save_model(self, embedder: HashedEmbedder, ivf: IVFIndex) -> None:
+        rows: List[Tuple[str, object]] = [
+            ("version", str(MODEL_VERSION)),
+            ("dim", str(embedder.dim)),
+            ("nlist", str(len(ivf.centroids))),
+            ("idf", embedder.idf.tobytes()),
+        ]
+        for index, (buckets, weights) in enumerate(ivf.centroids):
+            rows += [(f"centroid.{index}.b", buckets.tobytes()), (f"centroid.{index}.w", weights.tobytes())]
+        with self._conn:
+            # vectors embedded with the previous idf table or centroids are no longer comparable
+            self._conn.execute("DELETE FROM semantic_model")
+            self._conn.execute("DELETE FROM job_vectors")
+            self._conn.executemany("INSERT INTO semantic_model (key, value) VALUES (?, ?)", rows)
+
+    def vectors(self, hashes: Sequence[str]) -> Dict[str, Tuple[Vector, int]]:
+        found: Dict[str, Tuple[Vector, int]] = {}
+        for start in range(0, len(hashes), _LOOKUP_BATCH):
+            batch = hashes[start : start + _LOOKUP_BATCH]
+            rows = self._conn.execute(
+                "SELECT content_hash, buckets, weights, list_id FROM job_vectors "
+                f"WHERE content_hash IN ({', '.join('?' for _ in batch)})",
+                batch,
+            )
+            for key, buckets, weights, list_id in rows:
+                found[key] = (_unpack(buckets, weights), list_id)
+        return found
+
+    def put(self, rows: Iterable[Tuple[str, Vector, int]]) -> None:
+        started = time.perf_counter()
+        payload = [(key, buckets.tobytes(), weights.tobytes(), list_id) for key, (buckets, weights), list_id in rows]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO job_vectors (content_hash, buckets, weights, list_id) VALUES (?, ?, ?, ?)",
+                payload,
+            )
+        metrics.observe("db_write_seconds", time.perf_counter() - started, table="job_vectors")
+        metrics.inc("db_rows_written_total", len(payload), table="job_vectors")
+
+    def count(self) -> int:
+        (total,) = self._conn.execute("SELECT COUNT(*) FROM job_vectors").fetchone()
+        return total
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SemanticStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class SemanticIndex:
+    def __init__(self, embedder: HashedEmbedder, ivf: IVFIndex, vectors: List[Vector]) -> None:
+        self.embedder = embedder
+        self.ivf = ivf
+        self.vectors = vectors
+        self.embedded = 0  # vectors computed by build() rather than loaded from the store
+
+    @classmethod
+    def build(
+        cls,
+        jobs: Sequence[JobListing],
+        store: Optional[SemanticStore] = None,
+        nlist: Optional[int] = None,
+        dim: int = DEFAULT_DIM,
+        seed: int = 7,
+        retrain: bool = False,
+    ) -> "SemanticIndex":
+        with metrics.stage("semantic_index") as stage:
+            fields = _job_fields(jobs)
+            hashes = [content_hash(*row) for row in fields]
+            model = None if store is None or retrain else store.load_model()
+            if model is None or not model[1].centroids:
+                terms = [job_terms(title, location, description) for title, _, location, description in fields]
+                embedder = HashedEmbedder.fit(terms, dim)
+                vectors = [embedder.embed(row) for row in terms]
+                del terms
+                nlist = nlist or max(1, min(256, round(math.sqrt(len(vectors)) / 4)))
+                sample = vectors if len(vectors) <= 32 * nlist else random.Random(seed).sample(vectors, 32 * nlist)
+                ivf = IVFIndex.train(sample, nlist, seed=seed) if vectors else IVFIndex([])
+                index = cls(embedder, ivf, vectors)
+                assigned = [ivf.assign(vector) for vector in vectors] if ivf.centroids else []
+                for position, list_id in enumerate(assigned):
+                    ivf.add(position, list_id)
+                index.embedded = len(vectors)
+                if store is not None:
+                    store.save_model(embedder, ivf)
+                    store.put(zip(hashes, vectors, assigned))
+            else:
+                embedder, ivf = model
+                stored = store.vectors(hashes)
+                index = cls(embedder, ivf, [])
+                fresh: List[Tuple[str, Vector, int]] = []
+                for position, (key, (title, _, location, description)) in enumerate(zip(hashes, fields)):
+                    hit = stored.get(key)
+                    if hit is None:
+                        vector = embedder.embed(job_terms(title, location, description))
+                        hit = (vector, ivf.assign(vector))
+                        fresh.append((key, *hit))
+                    index.vectors.append(hit[0])
+                    ivf.add(position, hit[1])
+                index.embedded = len(fresh)
+                if fresh:
+                    store.put(fresh)
+            stage.items = len(hashes)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, query: Vector, n: int, nprobe: int = 1, oversample: int = 4) -> List[Tuple[float, int]]:
+        if not self.vectors:
+            return []
+        ranked = self.ivf.similarities(query)
+        order = sorted(range(len(ranked)), key=ranked.__getitem__, reverse=True)
+        weights = dict(zip(*query))
+        vectors = self.vectors
+        scored: List[Tuple[float, int]] = []
+        # probe at least nprobe lists, and more until oversample * n vectors have been compared
+        for probed, list_id in enumerate(order):
+            if probed >= nprobe and len(scored) >= n * oversample:
+                break
+            for position in self.ivf.lists[list_id]:
+                buckets, values = vectors[position]
+                similarity = sum(weights.get(bucket, 0.0) * value for bucket, value in zip(buckets, values))
+                scored.append((similarity, position))
+        return heapq.nlargest(n, scored)
+
+    def candidates(
+        self, resume: Resume, prefs: UserPreferences, n: int = 2000, nprobe: int = 1, oversample: int = 4
+    ) -> List[int]:
+        if n >= len(self.vectors):
+            return list(range(len(self.vectors)))
+        hits = self.search(self.embedder.embed(query_terms(resume, prefs)), n, nprobe, oversample)
+        # original order keeps the keyword scorer's tie-breaking identical to a full scan
+        return sorted(position for _, position in hits)
+
+
+def semantic_top_k_matches(
+    resume: Resume,
+    jobs: Sequence[JobListing],
+    prefs: UserPreferences,
+    index: SemanticIndex,
+    k: Optional[int] = None,
+    min_score: Optional[float] = None,
+    candidates: int = 2000,
+    nprobe: int = 1,
+    oversample: int = 4,
+    cache: Optional["FeatureCache"] = None,
+) -> List[MatchResult]:
+    if len(index) != len(jobs):
+        raise ValueError(f"semantic index covers {len(index)} job(s) but {len(jobs)} were given")
+    with metrics.stage("semantic_retrieve") as stage:
+        positions = index.candidates(resume, prefs, n=candidates, nprobe=nprobe, oversample=oversample)
+        stage.items = len(positions)
+    shortlist = [jobs[position] for position in positions]
+    return top_k_matches(resume, shortlist, prefs, k=k, min_score=min_score, cache=cache)
+
+
+def job_terms(title: str, location: str, description: str) -> List[str]:
+    # titles are short but the most telling field, so their terms count twice
+    title_terms = _terms(title)
+    return title_terms + title_terms + _terms(location) + _terms(description)
+
+
+def query_terms(resume: Resume, prefs: UserPreferences) -> List[str]:
+    # weighted like the keyword scorer that reranks the candidates: required skills first, then
+    # target titles and locations, then optional and resume skills
+    terms = _terms(" ".join(prefs.required_skills)) * 3
+    terms += _terms(" ".join(prefs.target_titles + prefs.target_locations)) * 2
+    terms += _terms(" ".join(prefs.optional_skills + resume.skills))
+    return terms
+
+
+def _terms(text: str) -> List[str]:
+    return [term.rstrip(".") for term in _TERM_RE.findall(text.lower())]
+
+
+def _job_fields(jobs: Sequence[JobListing]) -> List[Tuple[str, str, str, str]]:
+    if isinstance(jobs, JobBatch):
+        return list(zip(jobs.titles, jobs.companies, jobs.locations, jobs.descriptions))
+    return [(job.title, job.company, job.location, job.description) for job in jobs]
+
+
+def _vector(weights: Dict[int, float]) -> Vector:
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    buckets = sorted(bucket for bucket, weight in weights.items() if weight)
+    return array("I", buckets), array("f", (weights[bucket] / norm for bucket in buckets))
+
+
+def _unpack(buckets: bytes, weights: bytes) -> Vector:
+    return _unpack_array("I", buckets), _unpack_array("f", weights)
+
+
+def _unpack_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    return values
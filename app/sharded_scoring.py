@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .corpus import JobCorpus
+from .job_store import JobBatchView
+from .matching import top_k_matches
+from .metrics import metrics
+from .models import MatchResult, Resume, UserPreferences
+
+# Multi-core top-k over a binary corpus (see app.corpus). Every worker maps the
+# corpus file itself, so the OS shares its pages and no JobListing is pickled on
+# the way in; a shard is just a (start, stop) row range. Each shard returns its own
+# top-k, and only those few results travel back to be merged.
+
+_corpus: Optional[JobCorpus] = None
+
+
+class ShardedScorer:
+    def __init__(self, corpus_path: Path, workers: Optional[int] = None, shards_per_worker: int = 4) -> None:
+        self.corpus_path = corpus_path
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+        self.corpus = JobCorpus(corpus_path)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_open_corpus, initargs=(str(corpus_path),)
+        )
+
+    def top_k(
+        self,
+        resume: Resume,
+        prefs: UserPreferences,
+        k: Optional[int] = None,
+        min_score: Optional[float] = None,
+        shards: Optional[int] = None,
+    ) -> List[MatchResult]:
+        if k is not None and k <= 0:
+            return []
+        with metrics.stage("sharded_top_k") as stage:
+            ranges = shard_ranges(len(self.corpus), shards or self.workers * self.shards_per_worker)
+            futures = [
+                self._pool.submit(_score_shard, start, stop, resume, prefs, k, min_score) for start, stop in ranges
+            ]
+            # shards are contiguous and each is ranked with ties in row order, so a stable
+            # sort of the concatenation reproduces the serial ranking exactly
+            matches = [match for future in futures for match in future.result()]
+            matches.sort(key=lambda match: match.score, reverse=True)
+            stage.items = len(self.corpus)
+        return matches if k is None else matches[:k]
+
+    def close(self) -> None:
+        self._pool.shutdown()
+        self.corpus.close()
+
+    def __enter__(self) -> "ShardedScorer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def sharded_top_k(
+    resume: Resume,
+    corpus_path: Path,
+    prefs: UserPreferences,
+    k: Optional[int] = None,
+    min_score: Optional[float] = None,
+    workers: Optional[int] = None,
+) -> List[MatchResult]:
+    with ShardedScorer(corpus_path, workers=workers) as scorer:
+        return scorer.top_k(resume, prefs, k=k, min_score=min_score)
+
+
+def shard_ranges(count: int, shards: int) -> List[Tuple[int, int]]:
+    shards = max(1, min(shards, count))
+    size, extra = divmod(count, shards)
+    ranges = []
+    start = 0
+    for index in range(shards):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _open_corpus(path: str) -> None:
+    global _corpus
+    _corpus = JobCorpus(Path(path))
+
+
+def _score_shard(
+    start: int, stop: int, resume: Resume, prefs: UserPreferences, k: Optional[int], min_score: Optional[float]
+) -> List[MatchResult]:
+    return top_k_matches(resume, JobBatchView(_corpus, start, stop), prefs, k=k, min_score=min_score)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+_SYMBOLS = "+#"
+
+
+class SkillMatcher:
+    def __init__(self, skills: Iterable[str], whole_words: bool = True) -> None:
+        self.skills: List[str] = list(dict.fromkeys(s.lower() for s in skills if s))
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # "+" and "#" count as word characters, so "c" is not found inside "c++" or "c#",
+        # except next to a skill's own leading/trailing symbol ("c++", "c#" still match)
+        self._symbols: List[Tuple[str, str]] = [
+            ("" if skill[0] in _SYMBOLS else _SYMBOLS, "" if skill[-1] in _SYMBOLS else _SYMBOLS)
+            for skill in self.skills
+        ]
+        for index, skill in enumerate(self.skills):
+            self._insert(skill, index)
+        self._link()
+
+    def find(self, text: str) -> List[str]:
+        return [self.skills[index] for index in sorted(self.find_indices(text))]
+
+    def find_indices(self, text: str) -> Set[int]:
+        lowered = text.lower()
+        found: Set[int] = set()
+        state = 0
+        goto, fail, output, skills, symbols = self._goto, self._fail, self._output, self.skills, self._symbols
+        whole_words = self.whole_words
+        for end, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                if index in found:
+                    continue
+                start = end - len(skills[index]) + 1
+                leading, trailing = symbols[index]
+                if not whole_words or (
+                    _is_boundary(lowered, start - 1, leading) and _is_boundary(lowered, end + 1, trailing)
+                ):
+                    found.add(index)
+        return found
+
+    def _insert(self, skill: str, index: int) -> None:
+        state = 0
+        for char in skill:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append(index)
+
+    def _link(self) -> None:
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, nxt in self._goto[state].items():
+                pending.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt].extend(self._output[self._fail[nxt]])
+
+
+def get_skill_matcher(skills: Iterable[str]) -> SkillMatcher:
+    return _compiled(tuple(sorted({s.lower() for s in skills if s})))
+
+
+@lru_cache(maxsize=32)
+def _compiled(skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skills)
+
+
+def _is_boundary(text: str, position: int, symbols: str = "") -> bool:
+    if position < 0 or position >= len(text):
+        return True
+    char = text[position]
+    return not (char.isalnum() or char == "_" or char in symbols)
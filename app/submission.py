@@ -1,55 +1,182 @@
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
 
+from .artifacts import ArtifactStore
 from .matching import MatchResult
+from .metrics import metrics
 from .models import ApplicationRecord, Resume, UserPreferences
-from .tailoring import build_cover_letter, tailor_resume_highlights
+from .scheduler import SubmissionScheduler
+from .tailoring import HighlightIndex, build_cover_letter, tailor_resume_highlights
+
+if TYPE_CHECKING:
+    from .feature_cache import FeatureCache
 
 
 class ApplicationLogger:
-    def __init__(self, db_path: Path) -> None:
+    def __init__(self, db_path: Path, batch_size: int = 50, flush_interval: float = 1.0) -> None:
         self.db_path = db_path
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pending: List[ApplicationRecord] = []
+        self._lock = threading.RLock()
+        self._closed = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
         self._init_db()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="application-logger", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
 
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS applications (
-                    job_id TEXT,
-                    job_title TEXT,
-                    company TEXT,
-                    platform TEXT,
-                    status TEXT,
-                    submitted_at TEXT,
-                    notes TEXT
-                )
-                """
-            )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            # the sqlite3 module runs DDL in autocommit mode, so each step and its version bump get
+            # an explicit transaction; a crash mid-migration then leaves the previous schema intact
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+                if version >= len(_MIGRATIONS):
+                    self._conn.commit()
+                    return
+                _MIGRATIONS[version](self._conn)
+                self._conn.execute(f"PRAGMA user_version = {version + 1}")
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
 
     def record(self, record: ApplicationRecord) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO applications (job_id, job_title, company, platform, status, submitted_at, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    record.job_id,
-                    record.job_title,
-                    record.company,
-                    record.platform,
-                    record.status,
-                    record.submitted_at.isoformat(),
-                    record.notes,
-                ),
-            )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ApplicationLogger is closed")
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending or self._closed:
+                return
+            pending, self._pending = self._pending, []
+            started = time.perf_counter()
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT INTO applications (job_id, job_title, company, platform, status, submitted_at, notes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            record.job_id,
+                            record.job_title,
+                            record.company,
+                            record.platform,
+                            record.status,
+                            record.submitted_at.isoformat(),
+                            record.notes,
+                        )
+                        for record in pending
+                    ],
+                )
+            metrics.observe("db_write_seconds", time.perf_counter() - started, table="applications")
+            metrics.inc("db_rows_written_total", len(pending), table="applications")
+
+    def has_applied(self, platform: str, job_id: str) -> bool:
+        # job ids are only unique per platform, as in the seen-jobs store
+        with self._lock:
+            if any(
+                record.platform == platform and record.job_id == job_id and record.status == "applied"
+                for record in self._pending
+            ):
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM applications WHERE platform = ? AND job_id = ? AND status = 'applied' LIMIT 1",
+                (platform, job_id),
+            ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+            self._conn.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "ApplicationLogger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+def _create_applications(conn: sqlite3.Connection) -> None:
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(applications)")]
+    if "id" in columns:
+        return
+    # left behind by a crash under older versions that ran this step outside a transaction
+    conn.execute("DROP TABLE IF EXISTS applications_new")
+    conn.execute(
+        """
+        CREATE TABLE applications_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            job_title TEXT,
+            company TEXT,
+            platform TEXT,
+            status TEXT,
+            submitted_at TEXT,
+            notes TEXT
+        )
+        """
+    )
+    if columns:
+        # databases written before the schema was versioned: keep their rows, in insertion order
+        conn.execute(
+            """
+            INSERT INTO applications_new (job_id, job_title, company, platform, status, submitted_at, notes)
+            SELECT COALESCE(job_id, ''), job_title, company, platform, status, submitted_at, notes
+            FROM applications ORDER BY rowid
+            """
+        )
+        conn.execute("DROP TABLE applications")
+    conn.execute("ALTER TABLE applications_new RENAME TO applications")
+
+
+def _index_applications(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications (job_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_submitted_at ON applications (submitted_at)")
+
+
+def _index_applications_platform(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_platform_job_id ON applications (platform, job_id)")
+
+
+_MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _create_applications,
+    _index_applications,
+    _index_applications_platform,
+]
 
 
 def apply_matches(
@@ -59,23 +186,35 @@ def apply_matches(
     cover_letter_template: Path,
     logger: ApplicationLogger,
     auto_approve: bool = False,
+    cache: Optional["FeatureCache"] = None,
+    skip_applied: bool = False,
+    prepare_workers: int = 4,
+    on_record: Optional[Callable[[ApplicationRecord], None]] = None,
+    artifact_store: Optional[ArtifactStore] = None,
 ) -> List[ApplicationRecord]:
-    records: List[ApplicationRecord] = []
+    selected: List[MatchResult] = []
     for match in matches:
         if match.score < prefs.min_score:
             continue
 
+        if skip_applied and logger.has_applied(match.job.platform, match.job.id):
+            continue
+
         if prefs.review_mode and not auto_approve:
             proceed = _prompt_user(match)
             if not proceed:
                 continue
 
-        highlights = tailor_resume_highlights(resume, match.job)
-        cover_letter = build_cover_letter(cover_letter_template, resume, match.job, highlights)
-        _persist_cover_letter(match, cover_letter)
+        selected.append(match)
 
-        time.sleep(max(prefs.throttle_seconds, 0))
+    highlight_index = HighlightIndex(resume)
 
+    def prepare(match: MatchResult) -> None:
+        highlights = tailor_resume_highlights(resume, match.job, cache=cache, index=highlight_index)
+        cover_letter = build_cover_letter(cover_letter_template, resume, match.job, highlights)
+        store.put(match.job, cover_letter)
+
+    def submit(match: MatchResult, _: None) -> ApplicationRecord:
         record = ApplicationRecord(
             job_id=match.job.id,
             job_title=match.job.title,
@@ -86,8 +225,24 @@ def apply_matches(
             notes=f"Score: {match.score:.2f}; skills: {', '.join(match.breakdown.skill_overlap)}",
         )
         logger.record(record)
-        records.append(record)
-    return records
+        metrics.inc("applications_submitted_total", platform=match.job.platform)
+        if on_record is not None:
+            on_record(record)
+        return record
+
+    scheduler: SubmissionScheduler[None, ApplicationRecord] = SubmissionScheduler(
+        prefs.throttle_seconds, prefs.platform_throttle_seconds, prepare_workers=prepare_workers
+    )
+    store = artifact_store or ArtifactStore()
+    try:
+        with metrics.stage("apply_matches") as stage:
+            stage.items = len(selected)
+            return scheduler.run(selected, prepare, submit)
+    finally:
+        if artifact_store is None:
+            store.close()
+        else:
+            store.flush()
 
 
 def _prompt_user(match: MatchResult) -> bool:
@@ -98,10 +253,3 @@ def _prompt_user(match: MatchResult) -> bool:
     reply = input(prompt).strip().lower()  # noqa: S322 - intentional interactive prompt
     return reply in {"y", "yes"}
 
-
-def _persist_cover_letter(match: MatchResult, cover_letter: str) -> None:
-    output_dir = Path("artifacts/cover_letters")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    sanitized = f"{match.job.company}_{match.job.title}".replace(" ", "_")
-    path = output_dir / f"{sanitized}.txt"
-    path.write_text(cover_letter, encoding="utf-8")
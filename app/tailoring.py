@@ -1,39 +1,91 @@
 from __future__ import annotations
 
+import math
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, AbstractSet, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .matching import _tokenize
+from .letter_template import load_template
+from .matching import _description_tokens, _tokenize
+from .metrics import metrics
 from .models import JobListing, Resume
 
+if TYPE_CHECKING:
+    from .feature_cache import FeatureCache
 
-def tailor_resume_highlights(resume: Resume, job: JobListing, limit: int = 5) -> List[str]:
-    desc_tokens = _tokenize(job.description)
-    highlights: List[str] = []
 
-    for line in resume.experience + resume.projects:
-        lower = line.lower()
-        if any(token in lower for token in desc_tokens):
-            highlights.append(line)
-        if len(highlights) >= limit:
-            break
+STOPWORDS = frozenset(
+    {"a", "an", "and", "as", "at", "be", "by", "for", "from", "in", "is", "of", "on", "or", "the", "to", "with", "we", "our", "you"}
+)
 
-    if not highlights:
-        # fall back to a few top skills
-        highlights = [f"Experience with {skill}" for skill in resume.skills[:limit]]
-    return highlights[:limit]
+
+class HighlightIndex:
+    def __init__(self, resume: Resume) -> None:
+        self.resume = resume
+        self.lines = resume.experience + resume.projects
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        line_counts = [Counter(_highlight_tokens(_tokenize(line))) for line in self.lines]
+        document_frequency = Counter(token for counts in line_counts for token in counts)
+        total = len(self.lines)
+        for position, counts in enumerate(line_counts):
+            for token, count in counts.items():
+                idf = math.log((1 + total) / (1 + document_frequency[token])) + 1.0
+                self.postings[token].append((position, count * idf))
+
+    def select(self, job_tokens: AbstractSet[str], limit: int = 5) -> List[str]:
+        scores: Dict[int, float] = defaultdict(float)
+        for token in _highlight_tokens(job_tokens):
+            for position, weight in self.postings.get(token, ()):
+                scores[position] += weight
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))
+        highlights = [self.lines[position] for position in ranked[:limit]]
+        if not highlights:
+            # fall back to a few top skills
+            highlights = [f"Experience with {skill}" for skill in self.resume.skills[:limit]]
+        return highlights[:limit]
+
+
+def tailor_resume_highlights(
+    resume: Resume,
+    job: JobListing,
+    limit: int = 5,
+    cache: Optional["FeatureCache"] = None,
+    index: Optional[HighlightIndex] = None,
+) -> List[str]:
+    with metrics.stage("tailor_resume_highlights") as stage:
+        stage.items = 1
+        index = index or HighlightIndex(resume)
+        return index.select(_description_tokens(job, cache), limit)
+
+
+def tailor_highlights_batch(
+    resume: Resume, jobs: Iterable[JobListing], limit: int = 5, cache: Optional["FeatureCache"] = None
+) -> List[List[str]]:
+    index = HighlightIndex(resume)
+    return [index.select(_description_tokens(job, cache), limit) for job in jobs]
 
 
 def build_cover_letter(template_path: Path, resume: Resume, job: JobListing, highlights: List[str]) -> str:
-    template = template_path.read_text(encoding="utf-8")
-    selected_skills = ", ".join(resume.skills[:6]) if resume.skills else ""
-    selected_highlight = highlights[0] if highlights else ""
-    company = job.company or "your team"
-
-    populated = (
-        template.replace("{JOB_TITLE}", job.title)
-        .replace("{COMPANY}", company)
-        .replace("{SKILLS}", selected_skills)
-        .replace("{HIGHLIGHT}", selected_highlight)
-    )
-    return populated
+    with metrics.stage("build_cover_letter") as stage:
+        stage.items = 1
+        template = load_template(template_path)
+        selected_skills = ", ".join(resume.skills[:6]) if resume.skills else ""
+        selected_highlight = highlights[0] if highlights else ""
+        company = job.company or "your team"
+
+        return template.render(
+            {
+                "JOB_TITLE": job.title,
+                "COMPANY": company,
+                "SKILLS": selected_skills,
+                "HIGHLIGHT": selected_highlight,
+            }
+        )
+
+
+def _highlight_tokens(tokens: Iterable[str]) -> Iterator[str]:
+    # description tokens keep surrounding punctuation ("aws."), so normalise before lookup
+    for token in tokens:
+        token = token.strip(".\\")
+        if len(token) > 1 and token not in STOPWORDS:
+            yield token
@@ -1,26 +1,56 @@
 from __future__ import annotations
 
 import tempfile
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Sequence
 
-from flask import Flask, flash, redirect, render_template, request, url_for
+from flask import Flask, Response, abort, flash, jsonify, redirect, render_template, request, url_for
 
-from .config import load_preferences
+from .feature_cache import FeatureCache
 from .job_scraper import MockScraper, gather_jobs
 from .matching import score_jobs
+from .matching_service import MatchingService
+from .metrics import metrics
 from .models import MatchResult, UserPreferences
-from .resume_parser import DEFAULT_KNOWN_SKILLS, parse_resume
+from .resume_cache import ResumeCache
+from .resume_parser import parse_resume, parse_resume_text
+from .run_queue import RunQueue
 from .submission import ApplicationLogger, apply_matches
 
 
-def create_app() -> Flask:
+# resolved next to the package: the service indexes it at import time, whatever the working directory
+DEFAULT_JOBS_PATH = Path(__file__).parent / "data" / "sample_jobs.json"
+
+
+def create_app(
+    enable_metrics: bool = True,
+    job_sources: Optional[Sequence[Path]] = None,
+    reload_interval: float = 2.0,
+    feature_cache_path: Optional[Path] = None,
+) -> Flask:
     app = Flask(__name__)
     app.secret_key = "dev-secret"  # local-only UI; replace for production
+    if enable_metrics:
+        metrics.enable()
+    # opt-in: a cold cache costs more than tokenizing, so it only pays off for repeated uploads
+    feature_cache = FeatureCache(feature_cache_path) if feature_cache_path is not None else None
+    resume_cache = ResumeCache()
+    if feature_cache is not None:
+        metrics.track("feature_cache", feature_cache.stats)
+    metrics.track("resume_cache", resume_cache.stats)
+    # the default job sources, their indexes, preferences and parsed resumes stay warm across requests
+    service = MatchingService(
+        job_sources or [DEFAULT_JOBS_PATH], resume_cache=resume_cache, reload_interval=reload_interval
+    )
+    metrics.track("matching_service", service.stats)
+    app.extensions["matching_service"] = service
+    application_logger = ApplicationLogger(Path("logs/applications.sqlite"))
+    runs = RunQueue()
 
     @app.get("/")
     def index():
-        prefs = load_preferences()
+        prefs = service.preferences()
         return render_template("index.html", prefs=prefs, matches=None, applications=None)
 
     @app.post("/submit")
@@ -30,52 +60,179 @@ def create_app() -> Flask:
         jobs_file = request.files.get("jobs")
 
         if not resume_file or resume_file.filename == "":
+            if _wants_json():
+                return jsonify({"error": "Please upload a resume file."}), 400
             flash("Please upload a resume file.")
             return redirect(url_for("index"))
 
-        prefs = _preferences_from_form()
+        prefs = _preferences_from_form(service.preferences())
 
         resume_path = _save_upload(resume_file)
-        jobs_path = _save_upload(jobs_file) if jobs_file and jobs_file.filename else Path("app/data/sample_jobs.json")
-
-        try:
-            known_skills = list({*DEFAULT_KNOWN_SKILLS, *prefs.required_skills, *prefs.optional_skills})
-            resume = parse_resume(resume_path, known_skills)
-            scraper = MockScraper(jobs_path)
-            jobs = gather_jobs([scraper], prefs.target_titles, prefs.target_locations)
-            matches = score_jobs(resume, jobs, prefs)
-
-            applications = None
-            if action == "apply":
-                logger = ApplicationLogger(Path("logs/applications.sqlite"))
-                applications = apply_matches(
-                    matches,
-                    resume,
-                    prefs,
-                    cover_letter_template=Path("app/templates/cover_letter.txt"),
-                    logger=logger,
-                    auto_approve=True,
-                )
-
-            return render_template(
-                "index.html",
-                prefs=prefs,
-                matches=matches,
-                applications=applications,
-                action=action,
-                resume_name=resume_file.filename,
-                jobs_name=jobs_file.filename if jobs_file and jobs_file.filename else "sample_jobs.json",
-            )
-        finally:
-            _safe_unlink(resume_path)
-            if jobs_file and jobs_file.filename:
-                _safe_unlink(jobs_path)
+        uploaded_jobs = bool(jobs_file and jobs_file.filename)
+        jobs_path = _save_upload(jobs_file) if uploaded_jobs else DEFAULT_JOBS_PATH
+        resume_name = resume_file.filename
+        jobs_name = jobs_file.filename if uploaded_jobs else "sample_jobs.json"
+
+        def run(progress) -> Dict[str, Any]:
+            try:
+                progress("parsing resume")
+                known_skills = service.known_skills(prefs)
+                if uploaded_jobs:
+                    resume = parse_resume(resume_path, known_skills, cache=resume_cache)
+                    progress("collecting jobs")
+                    scraper = MockScraper(jobs_path, hard_filters=prefs.hard_filters)
+                    jobs = gather_jobs([scraper], prefs.target_titles, prefs.target_locations)
+                    progress("scoring", jobs=len(jobs))
+                    matches = score_jobs(resume, jobs, prefs, cache=feature_cache)
+                else:
+                    resume = service.parse_resume(resume_path, known_skills)
+                    progress("scoring", jobs=service.stats()["jobs"])
+                    matches = service.score(resume, prefs)
+
+                applications = None
+                if action == "apply":
+                    eligible = sum(1 for match in matches if match.score >= prefs.min_score)
+                    submitted: List[str] = []
+
+                    def on_record(record) -> None:
+                        submitted.append(record.job_id)
+                        progress("applying", applied=len(submitted), total=eligible)
+
+                    progress("applying", applied=0, total=eligible)
+                    records = apply_matches(
+                        matches,
+                        resume,
+                        prefs,
+                        cover_letter_template=Path("app/templates/cover_letter.txt"),
+                        logger=application_logger,
+                        auto_approve=True,
+                        cache=feature_cache,
+                        on_record=on_record,
+                    )
+                    application_logger.flush()
+                    applications = [{"job_id": record.job_id, "status": record.status} for record in records]
+
+                return {
+                    "matches": [_match_to_dict(match) for match in matches],
+                    "applications": applications,
+                    "resume_name": resume_name,
+                    "jobs_name": jobs_name,
+                }
+            finally:
+                if feature_cache is not None:
+                    feature_cache.flush()
+                _safe_unlink(resume_path)
+                if uploaded_jobs:
+                    _safe_unlink(jobs_path)
+
+        metrics.inc("runs_submitted_total", action=action)
+        run_id = runs.submit(action, run)
+        if _wants_json():
+            return jsonify({"run_id": run_id, "status_url": url_for("run_status", run_id=run_id)}), 202
+        return redirect(url_for("run_page", run_id=run_id))
+
+    @app.get("/runs/<run_id>")
+    def run_page(run_id: str):
+        run = runs.get(run_id)
+        if run is None:
+            abort(404)
+        result = run.get("result") or {}
+        return render_template(
+            "index.html",
+            prefs=service.preferences(),
+            matches=result.get("matches"),
+            applications=result.get("applications"),
+            action=run["action"],
+            resume_name=result.get("resume_name"),
+            jobs_name=result.get("jobs_name"),
+            run=run,
+        )
+
+    @app.get("/api/runs/<run_id>")
+    def run_status(run_id: str):
+        run = runs.get(run_id)
+        if run is None:
+            return jsonify({"error": "unknown run"}), 404
+        return jsonify(run)
+
+    @app.get("/api/runs")
+    def recent_runs():
+        limit = _non_negative_int(request.args.get("limit", 20))
+        if limit is None:
+            return jsonify({"error": "limit must be a non-negative integer"}), 400
+        return jsonify(runs.recent(limit=limit))
+
+    @app.post("/api/profiles")
+    def create_profile():
+        prefs = service.preferences()
+        payload = request.get_json(silent=True)
+        if payload is not None and not isinstance(payload, dict):
+            return jsonify({"error": "expected a JSON object"}), 400
+        if payload is not None:
+            try:
+                prefs = _preferences_from_json(prefs, payload.get("prefs") or {})
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
+            if not payload.get("resume_text"):
+                return jsonify({"error": "resume_text is required"}), 400
+            resume = parse_resume_text(payload["resume_text"], service.known_skills(prefs))
+        else:
+            resume_file = request.files.get("resume")
+            if not resume_file or resume_file.filename == "":
+                return jsonify({"error": "Please upload a resume file."}), 400
+            prefs = _preferences_from_form(prefs)
+            resume_path = _save_upload(resume_file)
+            try:
+                resume = service.parse_resume(resume_path, service.known_skills(prefs))
+            finally:
+                _safe_unlink(resume_path)
+        profile_id = service.add_profile(resume, prefs)
+        return jsonify({"profile_id": profile_id, "skills": resume.skills}), 201
+
+    @app.post("/api/score")
+    def score_profiles():
+        payload = request.get_json(silent=True) or {}
+        if not isinstance(payload, dict):
+            return jsonify({"error": "expected a JSON object"}), 400
+        profile_ids = payload.get("profile_ids") or ([payload["profile_id"]] if payload.get("profile_id") else [])
+        if not profile_ids:
+            return jsonify({"error": "profile_id or profile_ids is required"}), 400
+        k = payload.get("k", 10)
+        if k is not None:
+            k = _non_negative_int(k)
+            if k is None:
+                return jsonify({"error": "k must be a non-negative integer"}), 400
+        min_score = payload.get("min_score")
+        if min_score is not None:
+            min_score = _score_value(min_score)
+            if min_score is None:
+                return jsonify({"error": "min_score must be a number between 0 and 1"}), 400
+        started = time.perf_counter()
+        scored = service.score_profiles(profile_ids, k=k, min_score=min_score)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        results = {
+            profile_id: None if matches is None else [_match_to_dict(match) for match in matches]
+            for profile_id, matches in scored.items()
+        }
+        unknown = [profile_id for profile_id, matches in results.items() if matches is None]
+        return jsonify({"results": results, "unknown_profiles": unknown, "elapsed_ms": round(elapsed_ms, 3)})
+
+    @app.get("/api/service")
+    def service_status():
+        return jsonify(service.stats())
+
+    @app.get("/metrics")
+    def prometheus_metrics():
+        return Response(metrics.to_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    @app.get("/api/metrics")
+    def metrics_json():
+        return Response(metrics.to_json(), mimetype="application/json")
 
     return app
 
 
-def _preferences_from_form() -> UserPreferences:
-    prefs = load_preferences()
+def _preferences_from_form(prefs: UserPreferences) -> UserPreferences:
     prefs.target_titles = _split_csv(request.form.get("target_titles", ""), fallback=prefs.target_titles)
     prefs.target_locations = _split_csv(request.form.get("target_locations", ""), fallback=prefs.target_locations)
     prefs.required_skills = [s.lower() for s in _split_csv(request.form.get("required_skills", ""), fallback=prefs.required_skills)]
@@ -86,6 +243,62 @@ def _preferences_from_form() -> UserPreferences:
     return prefs
 
 
+def _preferences_from_json(prefs: UserPreferences, raw: Dict[str, Any]) -> UserPreferences:
+    if not isinstance(raw, dict):
+        raise ValueError("prefs must be an object")
+    for name in ("target_titles", "target_locations", "required_skills", "optional_skills"):
+        values = raw.get(name)
+        if not values:
+            continue
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"{name} must be a list of strings")
+        setattr(prefs, name, [value.lower() for value in values] if name.endswith("_skills") else list(values))
+    if raw.get("min_score") is not None:
+        min_score = _score_value(raw["min_score"])
+        if min_score is None:
+            raise ValueError("min_score must be a number between 0 and 1")
+        prefs.min_score = min_score
+    return prefs
+
+
+def _match_to_dict(match: MatchResult) -> Dict[str, Any]:
+    job = match.job
+    return {
+        "job": {"id": job.id, "title": job.title, "company": job.company, "location": job.location, "url": job.url},
+        "score": match.score,
+        "breakdown": {
+            "skill_overlap": match.breakdown.skill_overlap,
+            "location_match": match.breakdown.location_match,
+            "title_match": match.breakdown.title_match,
+            "keyword_hits": match.breakdown.keyword_hits,
+        },
+    }
+
+
+def _non_negative_int(raw: Any) -> Optional[int]:
+    if isinstance(raw, bool):
+        return None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+def _score_value(raw: Any) -> Optional[float]:
+    if isinstance(raw, bool):
+        return None
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if 0.0 <= value <= 1.0 else None
+
+
+def _wants_json() -> bool:
+    return request.accept_mimetypes.best == "application/json"
+
+
 def _split_csv(raw: str, fallback: List[str]) -> List[str]:
     raw = raw.strip()
     if not raw:
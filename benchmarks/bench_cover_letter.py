@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models import JobListing, Resume  # noqa: E402
+from app.tailoring import build_cover_letter  # noqa: E402
+
+
+def _legacy_cover_letter(template_path: Path, resume: Resume, job: JobListing, highlights: list) -> str:
+    template = template_path.read_text(encoding="utf-8")
+    return (
+        template.replace("{JOB_TITLE}", job.title)
+        .replace("{COMPANY}", job.company or "your team")
+        .replace("{SKILLS}", ", ".join(resume.skills[:6]))
+        .replace("{HIGHLIGHT}", highlights[0] if highlights else "")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cover letter rendering throughput")
+    parser.add_argument("--letters", type=int, default=20000)
+    parser.add_argument("--template", default="app/templates/cover_letter.txt")
+    args = parser.parse_args()
+
+    template = Path(args.template)
+    resume = Resume(raw_text="", skills=["python", "django", "aws", "docker", "postgres", "redis"])
+    jobs = [
+        JobListing(id=str(i), title=f"Backend Engineer {i}", company=f"Company {i}", location="Remote", description="")
+        for i in range(args.letters)
+    ]
+    highlights = ["Built and maintained Django services on AWS"]
+
+    for label, render in (("legacy replace", _legacy_cover_letter), ("compiled template", build_cover_letter)):
+        started = time.perf_counter()
+        for job in jobs:
+            render(template, resume, job, highlights)
+        elapsed = time.perf_counter() - started
+        print(f"{label:>18}: {args.letters / elapsed:,.0f} letters/s ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
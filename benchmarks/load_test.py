@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.resume_parser import DEFAULT_KNOWN_SKILLS  # noqa: E402
+from benchmarks.synthetic import TITLES, LOCATIONS, generate_jobs, generate_resume, write_jobs_jsonl  # noqa: E402
+
+# (path, JSON payload or None for GET) -> decoded JSON response
+Call = Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]]
+
+
+def local_client() -> Call:
+    from app.web import create_app
+
+    app = create_app(enable_metrics=False, job_sources=[Path("jobs.jsonl")], reload_interval=0.5)
+    local = threading.local()
+
+    def call(path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        response = client.get(path) if payload is None else client.post(path, json=payload)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{path} -> {response.status_code}: {response.get_data(as_text=True)}")
+        return response.get_json()
+
+    return call
+
+
+def remote_client(base_url: str) -> Call:
+    def call(path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        request = urllib.request.Request(
+            base_url.rstrip("/") + path,
+            data=None if payload is None else json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+
+    return call
+
+
+def register_profiles(call: Call, count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    profile_ids = []
+    for index in range(count):
+        skills = rng.sample(DEFAULT_KNOWN_SKILLS, 6)
+        prefs = {
+            "target_titles": rng.sample(TITLES, 2),
+            "target_locations": rng.sample(LOCATIONS, 3),
+            "required_skills": skills[:3],
+            "optional_skills": skills[3:],
+        }
+        payload = {"resume_text": generate_resume(seed + index), "prefs": prefs}
+        profile_ids.append(call("/api/profiles", payload)["profile_id"])
+    return profile_ids
+
+
+def run_load(call: Call, profile_ids: List[str], requests: int, threads: int, k: int, seed: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    server_ms: List[float] = []
+    lock = threading.Lock()
+    per_thread = max(requests // threads, 1)
+
+    def worker(worker_index: int) -> None:
+        rng = random.Random(seed + worker_index)
+        local_latencies, local_server = [], []
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            result = call("/api/score", {"profile_id": rng.choice(profile_ids), "k": k})
+            local_latencies.append((time.perf_counter() - started) * 1000)
+            local_server.append(result["elapsed_ms"])
+        with lock:
+            latencies.extend(local_latencies)
+            server_ms.extend(local_server)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "client_ms": _percentiles(latencies),
+        "service_ms": _percentiles(server_ms),
+    }
+
+
+def append_jobs(path: Path, count: int, seed: int, delay: float) -> threading.Thread:
+    def write() -> None:
+        time.sleep(delay)
+        with path.open("a", encoding="utf-8") as fh:
+            for job in generate_jobs(count, seed):
+                record = {
+                    "id": f"live-{job.id}",
+                    "title": job.title,
+                    "company": job.company,
+                    "location": job.location,
+                    "description": job.description,
+                    "platform": job.platform,
+                    "url": job.url,
+                }
+                fh.write(json.dumps(record) + "\n")
+
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    return thread
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p90": None, "p99": None, "max": None, "mean": None}
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
+
+    return {
+        "p50": pick(0.5),
+        "p90": pick(0.9),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 3),
+        "mean": round(statistics.fmean(ordered), 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the warm matching service behind /api/score")
+    parser.add_argument("--jobs", type=int, default=50_000, help="Synthetic corpus size served by the in-process app")
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--append", type=int, default=0, help="Append this many jobs to the corpus mid-run (hot reload)")
+    parser.add_argument("--url", default=None, help="Hit a running server instead, e.g. http://127.0.0.1:5000")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.TemporaryDirectory(prefix="load-test-")
+    if args.url:
+        call = remote_client(args.url)
+    else:
+        # run inside a scratch directory so the app's logs and caches do not touch the checkout
+        os.chdir(workdir.name)
+        write_jobs_jsonl(Path("jobs.jsonl"), args.jobs, seed=args.seed)
+        started = time.perf_counter()
+        call = local_client()
+        print(f"Service warmed with {args.jobs:,} jobs in {time.perf_counter() - started:.2f}s")
+
+    profile_ids = register_profiles(call, args.profiles, args.seed)
+    print(f"Registered {len(profile_ids)} profile(s)")
+    run_load(call, profile_ids, min(args.requests, 50), 1, args.k, args.seed)  # warm-up
+
+    writer = None
+    if args.append and not args.url:
+        writer = append_jobs(Path("jobs.jsonl"), args.append, args.seed + 1, delay=0.2)
+    report = run_load(call, profile_ids, args.requests, args.threads, args.k, args.seed)
+    if writer is not None:
+        writer.join()
+        time.sleep(1.5)  # let the service watcher index the appended lines
+        report["after_append"] = run_load(call, profile_ids, min(args.requests, 200), args.threads, args.k, args.seed)
+    report["service"] = call("/api/service", None)
+
+    print(json.dumps(report, indent=2))
+    workdir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.batch_scoring import BatchScorer  # noqa: E402
+from app.config import DEFAULT_CONFIG_PATH, load_preferences  # noqa: E402
+from app.corpus import convert_json, open_corpus  # noqa: E402
+from app.feature_cache import FeatureCache  # noqa: E402
+from app.job_filter import HARD_FILTERS  # noqa: E402
+from app.job_scraper import MockScraper, gather_jobs  # noqa: E402
+from app.job_store import JobBatch  # noqa: E402
+from app.matching import JobIndex, score_jobs, top_k_matches  # noqa: E402
+from app.models import ApplicationRecord, MatchResult, Resume, UserPreferences  # noqa: E402
+from app.resume_parser import DEFAULT_KNOWN_SKILLS, parse_resume  # noqa: E402
+from app.semantic import SemanticIndex, SemanticStore, semantic_top_k_matches  # noqa: E402
+from app.sharded_scoring import ShardedScorer  # noqa: E402
+from app.submission import ApplicationLogger  # noqa: E402
+from app.tailoring import HighlightIndex, build_cover_letter, tailor_resume_highlights  # noqa: E402
+from benchmarks.synthetic import generate_resume, write_jobs_jsonl  # noqa: E402
+
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "app" / "templates" / "cover_letter.txt"
+
+
+class Harness:
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.results: List[Dict[str, Any]] = []
+        self.failures: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str, size: int, items: int) -> Iterator[None]:
+        if self.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            peak = None
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            self.results.append(
+                {
+                    "stage": name,
+                    "size": size,
+                    "items": items,
+                    "seconds": round(elapsed, 6),
+                    "items_per_second": round(items / elapsed, 2) if elapsed > 0 else None,
+                    "peak_bytes": peak,
+                }
+            )
+            peak_text = f"{peak / 1_048_576:9.1f} MiB" if peak is not None else "        n/a"
+            print(f"{name:>24} | n={size:>10,} | {elapsed:9.3f}s | {items / max(elapsed, 1e-9):>14,.0f}/s | {peak_text}")
+
+
+def run_size(harness: Harness, size: int, args: argparse.Namespace, workdir: Path) -> None:
+    prefs = load_preferences(Path(args.config))
+    prefs.throttle_seconds = 0
+    known_skills = list({*DEFAULT_KNOWN_SKILLS, *prefs.required_skills, *prefs.optional_skills})
+    sample = min(size, args.sample)
+
+    jobs_path = write_jobs_jsonl(workdir / f"jobs-{size}.jsonl", size, seed=args.seed)
+
+    resume_count = min(max(size // 1000, 10), 500)
+    resume_paths = []
+    for index in range(resume_count):
+        path = workdir / f"resume-{index}.txt"
+        path.write_text(generate_resume(args.seed + index), encoding="utf-8")
+        resume_paths.append(path)
+    with harness.stage("parse_resume", size, resume_count):
+        resumes = [parse_resume(path, known_skills) for path in resume_paths]
+    resume = resumes[0]
+
+    scraper = MockScraper(jobs_path)
+    materialize = size <= args.max_materialized
+    if materialize:
+        with harness.stage("gather_jobs", size, size):
+            jobs = gather_jobs([scraper], prefs.target_titles, prefs.target_locations)
+        with harness.stage("score_jobs", size, size):
+            score_jobs(resume, jobs, prefs)
+        # the opt-in token cache: the first pass fills it, the second should beat plain score_jobs
+        cache_path = workdir / f"features-{size}.sqlite"
+        for stage in ("feature_cache_cold", "feature_cache_warm"):
+            with harness.stage(stage, size, size):
+                with FeatureCache(cache_path, max_entries=max(size, 500_000)) as cache:
+                    score_jobs(resume, jobs, prefs, cache=cache)
+        cache_path.unlink()
+        with harness.stage("threshold_top_k", size, size):
+            top_k_matches(resume, jobs, prefs, k=args.top_k, min_score=prefs.min_score)
+        with harness.stage("batch_top_k", size, size):
+            index = JobIndex(jobs)
+            BatchScorer(index).top_k(resume, prefs, args.top_k)
+        with harness.stage("index_threshold_top_k", size, size):
+            top_k_matches(resume, index, prefs, k=args.top_k, min_score=prefs.min_score)
+        del index
+        if args.semantic_candidates:
+            semantic_path = workdir / f"semantic-{size}.sqlite"
+            with harness.stage("semantic_index_build", size, size):
+                with SemanticStore(semantic_path) as store:
+                    SemanticIndex.build(jobs, store)
+            with harness.stage("semantic_index_reopen", size, size):
+                with SemanticStore(semantic_path) as store:
+                    semantic_index = SemanticIndex.build(jobs, store)
+            with harness.stage("semantic_top_k", size, size):
+                approx = semantic_top_k_matches(
+                    resume, jobs, prefs, semantic_index, k=args.top_k, candidates=args.semantic_candidates
+                )
+            recall = score_recall(top_k_matches(resume, jobs, prefs, k=args.top_k), approx)
+            harness.results[-1]["recall"] = recall
+            print(f"{'':>24}   recall@{args.top_k} against a full scan: {recall:.2f}")
+            del semantic_index
+            semantic_path.unlink()
+        del jobs[sample:]
+        with harness.stage("job_batch_load", size, size):
+            batch = JobBatch.from_jobs(scraper.iter_jobs(prefs.target_titles, prefs.target_locations))
+        with harness.stage("job_batch_top_k", size, size):
+            top_k_matches(resume, batch, prefs, k=args.top_k)
+        del batch
+        sample_jobs = jobs[:sample]
+    else:
+        with harness.stage("stream_top_k", size, size):
+            top_k_matches(resume, scraper.iter_jobs(prefs.target_titles, prefs.target_locations), prefs, k=args.top_k)
+        sample_jobs = [job for _, job in zip(range(sample), scraper.iter_jobs([], []))]
+
+    filtered = MockScraper(jobs_path, hard_filters=HARD_FILTERS)
+    with harness.stage("hard_filter_top_k", size, size):
+        top_k_matches(resume, filtered.iter_jobs(prefs.target_titles, prefs.target_locations), prefs, k=args.top_k)
+
+    corpus_path = workdir / f"jobs-{size}.corpus"
+    with harness.stage("corpus_build", size, size):
+        convert_json([jobs_path], corpus_path)
+    with harness.stage("corpus_open", size, size):
+        corpus = open_corpus(corpus_path)
+    with harness.stage("corpus_top_k", size, size):
+        top_k_matches(resume, corpus, prefs, k=args.top_k)
+    with ShardedScorer(corpus_path, workers=args.workers) as scorer:
+        scorer.top_k(resume, prefs, k=args.top_k)  # start the worker processes outside the timing
+        with harness.stage("sharded_top_k", size, size):
+            scorer.top_k(resume, prefs, k=args.top_k)
+        if args.verify:
+            harness.failures += verify_sharded(scorer, corpus, resumes[:3], prefs, args.top_k)
+    corpus.close()
+    corpus_path.unlink()
+
+    highlight_index = HighlightIndex(resume)
+    with harness.stage("tailor_resume_highlights", size, len(sample_jobs)):
+        highlights = [tailor_resume_highlights(resume, job, index=highlight_index) for job in sample_jobs]
+
+    with harness.stage("build_cover_letter", size, len(sample_jobs)):
+        for job, picked in zip(sample_jobs, highlights):
+            build_cover_letter(TEMPLATE_PATH, resume, job, picked)
+
+    with harness.stage("application_logger_record", size, len(sample_jobs)):
+        with ApplicationLogger(workdir / f"applications-{size}.sqlite") as logger:
+            for job in sample_jobs:
+                logger.record(
+                    ApplicationRecord(
+                        job_id=job.id,
+                        job_title=job.title,
+                        company=job.company,
+                        platform=job.platform,
+                        status="applied",
+                        submitted_at=datetime.utcnow(),
+                    )
+                )
+
+    jobs_path.unlink()
+
+
+def verify_sharded(
+    scorer: ShardedScorer, corpus: JobBatch, resumes: List[Resume], prefs: UserPreferences, top_k: int
+) -> List[str]:
+    # sharded results must equal the serial path exactly: same jobs, scores, breakdowns and tie order
+    failures = []
+    shard_counts = sorted({1, 3, 7, scorer.workers * scorer.shards_per_worker})
+    for number, resume in enumerate(resumes):
+        for k in (1, top_k, None):
+            for min_score in (None, prefs.min_score):
+                expected = top_k_matches(resume, corpus, prefs, k=k, min_score=min_score)
+                for shards in shard_counts:
+                    actual = scorer.top_k(resume, prefs, k=k, min_score=min_score, shards=shards)
+                    if actual != expected:
+                        failures.append(
+                            f"sharded_top_k differs from serial for resume {number}, k={k}, "
+                            f"min_score={min_score}, shards={shards} ({len(actual)} vs {len(expected)} matches)"
+                        )
+    checks = len(resumes) * 3 * 2 * len(shard_counts)
+    print(f"{'':>24}   verified sharded_top_k against the serial path: {checks - len(failures)}/{checks} identical")
+    return failures
+
+
+def score_recall(exact: List[MatchResult], approx: List[MatchResult]) -> float:
+    # share of the exact top-k scores reached; ids are not compared because equal scores tie arbitrarily
+    if not exact:
+        return 1.0
+    cutoff = exact[-1].score
+    return sum(1 for match in approx if match.score >= cutoff) / len(exact)
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path, tolerance: float) -> List[str]:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(row["stage"], row["size"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["stage"], row["size"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{row['stage']} @ {row['size']:,}: {old['seconds']:.3f}s -> {row['seconds']:.3f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline benchmark on seeded synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000], help="Job corpus sizes, e.g. 10000 1000000 10000000")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="Preferences JSON used for scoring")
+    parser.add_argument("--sample", type=int, default=10_000, help="Jobs used for tailoring, letters and DB writes")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument(
+        "--max-materialized",
+        type=int,
+        default=1_000_000,
+        help="Largest corpus loaded into memory; bigger sizes are benchmarked through the streaming top-k path",
+    )
+    parser.add_argument(
+        "--semantic-candidates",
+        type=int,
+        default=2_000,
+        help="Shortlist size for the semantic retrieval stages (0 skips them; building the index is slow above ~1M jobs)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Processes for sharded_top_k (default: CPU count)")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check that sharded scoring returns exactly the serial results for several k, thresholds and shard counts",
+    )
+    parser.add_argument("--no-trace-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory)")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write machine-readable results")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline before failing")
+    args = parser.parse_args(argv)
+
+    harness = Harness(trace_memory=not args.no_trace_memory)
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        for size in args.sizes:
+            run_size(harness, size, args, Path(tmp))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "trace_memory": harness.trace_memory,
+        },
+        "results": harness.results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if harness.failures:
+        print("Verification failed:")
+        for line in harness.failures:
+            print(f" - {line}")
+        return 1
+
+    if args.baseline:
+        baseline_meta = json.loads(Path(args.baseline).read_text(encoding="utf-8")).get("meta", {})
+        if baseline_meta.get("trace_memory") != harness.trace_memory:
+            print("Warning: baseline was recorded with a different --no-trace-memory setting; timings are not comparable")
+        regressions = compare(harness.results, Path(args.baseline), args.tolerance)
+        if regressions:
+            print("Performance regressions against baseline:")
+            for line in regressions:
+                print(f" - {line}")
+            return 1
+        print(f"No stage slower than baseline by more than {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Iterator, List
+
+from app.models import JobListing
+from app.resume_parser import DEFAULT_KNOWN_SKILLS
+
+
+TITLES = [
+    "Software Engineer",
+    "Backend Engineer",
+    "Full Stack Engineer",
+    "Senior Software Engineer",
+    "Machine Learning Engineer",
+    "Data Engineer",
+    "Platform Engineer",
+    "Site Reliability Engineer",
+    "Frontend Engineer",
+    "Data Analyst",
+]
+LOCATIONS = [
+    "Remote",
+    "Remote - US",
+    "United States",
+    "New York, NY",
+    "San Francisco, CA",
+    "Austin, TX",
+    "London, UK",
+    "Berlin, Germany",
+    "Toronto, Canada",
+    "Hybrid - Seattle, WA",
+]
+PLATFORMS = ["linkedin", "indeed", "greenhouse", "lever", "mockboard"]
+FILLER = (
+    "we are building a team that ships reliable services for customers across the world and values ownership "
+    "collaboration mentoring testing observability performance security documentation code review on call "
+    "experience with distributed systems api design cloud infrastructure ci/cd pipelines agile delivery"
+).split()
+EXTRA_SKILLS = ["graphql", "spark", "airflow", "snowflake", "rust", "scala", "elasticsearch", "grpc", "linux", "git"]
+
+
+def generate_jobs(count: int, seed: int = 7) -> Iterator[JobListing]:
+    rng = random.Random(seed)
+    companies = [f"Company {index}" for index in range(max(count // 20, 50))]
+    skills = DEFAULT_KNOWN_SKILLS + EXTRA_SKILLS
+    for index in range(count):
+        picked = rng.sample(skills, rng.randint(3, 9))
+        words = rng.choices(FILLER, k=rng.randint(25, 70)) + picked
+        rng.shuffle(words)
+        yield JobListing(
+            id=f"job-{index:08d}",
+            title=rng.choice(TITLES),
+            company=rng.choice(companies),
+            location=rng.choice(LOCATIONS),
+            description=" ".join(words).capitalize() + ".",
+            platform=rng.choice(PLATFORMS),
+            url=f"https://jobs.example.com/{index}",
+        )
+
+
+def generate_resume(seed: int = 7) -> str:
+    rng = random.Random(seed)
+    skills = rng.sample(DEFAULT_KNOWN_SKILLS + EXTRA_SKILLS, 10)
+    experience = [
+        f"- Built {rng.choice(['services', 'pipelines', 'dashboards', 'APIs'])} with {a} and {b} serving "
+        f"{rng.randint(1, 900)}k users."
+        for a, b in zip(skills[::2], skills[1::2])
+    ]
+    lines: List[str] = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | +1 555 555 {seed % 10000:04d}",
+        "",
+        "Skills",
+        ", ".join(skill.title() for skill in skills),
+        "",
+        "Experience",
+        *experience,
+        "",
+        "Education",
+        "B.S. in Computer Science",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_jobs_jsonl(path: Path, count: int, seed: int = 7) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for job in generate_jobs(count, seed):
+            fh.write(
+                json.dumps(
+                    {
+                        "id": job.id,
+                        "title": job.title,
+                        "company": job.company,
+                        "location": job.location,
+                        "description": job.description,
+                        "platform": job.platform,
+                        "url": job.url,
+                    }
+                )
+            )
+            fh.write("\n")
+    return path
@@ -2,61 +2,223 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence
 
+from app.artifacts import ARTIFACT_MODES, ArtifactStore
 from app.config import load_preferences
-from app.job_scraper import MockScraper, gather_jobs
-from app.matching import score_jobs
-from app.models import MatchResult
+from app.corpus import CorpusScraper
+from app.dedup import dedupe_jobs
+from app.feature_cache import DEFAULT_CACHE_PATH, FeatureCache
+from app.job_scraper import gather_jobs_concurrent, scraper_for_path, stream_jobs
+from app.job_store import JobBatch
+from app.matching import top_k_matches
+from app.metrics import metrics, profiled
+from app.models import JobListing, MatchResult, Resume, UserPreferences
+from app.resume_cache import DEFAULT_RESUME_CACHE_DIR, ResumeCache
 from app.resume_parser import DEFAULT_KNOWN_SKILLS, parse_resume
+from app.seen_jobs import DEFAULT_SEEN_JOBS_PATH, SeenJobStore, profile_hash
+from app.semantic import DEFAULT_INDEX_PATH, SemanticIndex, SemanticStore, semantic_top_k_matches
+from app.sharded_scoring import sharded_top_k
 from app.submission import ApplicationLogger, apply_matches
 
 
 def main() -> None:
     args = _parse_args()
-    prefs = load_preferences(Path(args.config))
-
-    known_skills = list({*DEFAULT_KNOWN_SKILLS, *prefs.required_skills, *prefs.optional_skills})
-    resume = parse_resume(Path(args.resume), known_skills)
+    if args.profile or args.profile_json or args.cprofile:
+        metrics.enable()
+    try:
+        with profiled(Path(args.cprofile) if args.cprofile else None):
+            _run(args)
+    finally:
+        if metrics.enabled:
+            _write_profile(args)
 
-    scraper = MockScraper(Path(args.jobs))
-    jobs = gather_jobs([scraper], prefs.target_titles, prefs.target_locations)
-    matches = score_jobs(resume, jobs, prefs)
 
-    _print_top_matches(matches, limit=5)
-
-    if args.dry_run:
-        return
+def _run(args: argparse.Namespace) -> None:
+    prefs = load_preferences(Path(args.config))
 
-    logger = ApplicationLogger(Path("logs/applications.sqlite"))
-    records = apply_matches(
-        matches,
-        resume,
-        prefs,
-        cover_letter_template=Path(args.cover_letter_template),
-        logger=logger,
-        auto_approve=args.auto_approve,
+    known_skills = list({*DEFAULT_KNOWN_SKILLS, *prefs.required_skills, *prefs.optional_skills})
+    # a dry run leaves nothing behind, caches included
+    resume_cache = None if args.no_resume_cache or args.dry_run else ResumeCache(Path(args.resume_cache))
+    if resume_cache is not None:
+        metrics.track("resume_cache", resume_cache.stats)
+    resume = parse_resume(Path(args.resume), known_skills, cache=resume_cache)
+
+    cache = FeatureCache(Path(args.feature_cache)) if args.feature_cache and not args.dry_run else None
+    if cache is not None:
+        metrics.track("feature_cache", cache.stats)
+    # only listings that can actually be applied to are kept; a dry run just previews the best few
+    min_score = None if args.dry_run else prefs.min_score
+    seen_store = SeenJobStore(DEFAULT_SEEN_JOBS_PATH, profile_hash(resume, prefs)) if args.incremental else None
+    processed: List[JobListing] = []
+    try:
+        scrapers = [scraper_for_path(Path(path), hard_filters=prefs.hard_filters) for path in args.jobs]
+        # the whole-corpus fast paths below skip scraper-level hard filters
+        single_corpus = len(scrapers) == 1 and isinstance(scrapers[0], CorpusScraper) and not prefs.hard_filters
+        if args.stream and single_corpus and args.score_workers > 1 and not args.semantic_candidates:
+            # each worker maps the corpus itself and scores a range of rows
+            matches = sharded_top_k(
+                resume, scrapers[0].corpus_path, prefs, k=args.top_k, min_score=min_score, workers=args.score_workers
+            )
+        elif args.stream:
+            if single_corpus:
+                # score straight from the mapped columns and precomputed tokens
+                job_stream = scrapers[0].corpus
+            else:
+                job_stream = stream_jobs(scrapers, prefs.target_titles, prefs.target_locations)
+                if args.semantic_candidates:
+                    # the semantic index needs positional access, so the stream is packed into columns
+                    job_stream = JobBatch.from_jobs(job_stream)
+            matches = _top_matches(args, resume, job_stream, prefs, k=args.top_k, min_score=min_score, cache=cache)
+        else:
+            gathered = gather_jobs_concurrent(
+                scrapers,
+                prefs.target_titles,
+                prefs.target_locations,
+                max_workers=args.max_workers,
+                timeout=args.source_timeout,
+                seen_store=seen_store,
+            )
+            for source, error in gathered.failures:
+                print(f"Skipping source {source}: {error}")
+            if args.incremental:
+                print(f"Skipped {gathered.unchanged} unchanged listing(s) already processed with these settings")
+            jobs = processed = gathered.jobs
+            if args.dedupe:
+                deduped = dedupe_jobs(jobs)
+                jobs = deduped.jobs
+                print(
+                    f"Merged {deduped.merged_count} duplicate listing(s) "
+                    f"({deduped.exact_duplicates} exact, {deduped.near_duplicates} near-duplicate)"
+                )
+            limit = 5 if args.dry_run else None
+            matches = _top_matches(args, resume, jobs, prefs, k=limit, min_score=min_score, cache=cache)
+
+        _print_top_matches(matches, limit=5)
+
+        if args.dry_run:
+            return
+
+        with ApplicationLogger(Path("logs/applications.sqlite")) as logger, ArtifactStore(mode=args.artifact_mode) as store:
+            records = apply_matches(
+                matches,
+                resume,
+                prefs,
+                cover_letter_template=Path(args.cover_letter_template),
+                logger=logger,
+                auto_approve=args.auto_approve,
+                cache=cache,
+                skip_applied=args.incremental,
+                artifact_store=store,
+            )
+        if seen_store is not None:
+            # every scored listing is done for this resume and these preferences, applied or not;
+            # has_applied separately keeps applied jobs from being submitted twice
+            seen_store.mark_seen(processed)
+
+        print(f"Completed {len(records)} application(s). Logs stored in logs/applications.sqlite")
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _top_matches(
+    args: argparse.Namespace,
+    resume: Resume,
+    jobs: Sequence[JobListing],
+    prefs: UserPreferences,
+    k: Optional[int],
+    min_score: Optional[float],
+    cache: Optional[FeatureCache],
+) -> List[MatchResult]:
+    if not args.semantic_candidates:
+        return top_k_matches(resume, jobs, prefs, k=k, min_score=min_score, cache=cache)
+    with SemanticStore(Path(args.semantic_index)) as store:
+        index = SemanticIndex.build(jobs, store=store, retrain=args.semantic_retrain)
+    print(f"Semantic index: {len(index)} job(s), {index.embedded} newly embedded, {len(index.ivf.lists)} list(s)")
+    return semantic_top_k_matches(
+        resume, jobs, prefs, index, k=k, min_score=min_score, candidates=args.semantic_candidates, cache=cache
     )
 
-    print(f"Completed {len(records)} application(s). Logs stored in logs/applications.sqlite")
-
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Automated Job Application System (mock pipeline)")
     parser.add_argument("--resume", default="app/data/sample_resume.txt", help="Path to resume file (txt/pdf/docx)")
-    parser.add_argument("--jobs", default="app/data/sample_jobs.json", help="Path to job listing JSON fixture")
+    parser.add_argument(
+        "--jobs",
+        nargs="+",
+        default=["app/data/sample_jobs.json"],
+        help="Path(s) to job listing JSON/JSONL fixtures or .corpus files; each path is collected as its own source",
+    )
+    parser.add_argument("--max-workers", type=int, default=8, help="Maximum number of sources fetched concurrently")
+    parser.add_argument("--source-timeout", type=float, default=None, help="Per-source fetch timeout in seconds")
     parser.add_argument("--config", default="app/config/settings.json", help="Path to preferences JSON")
     parser.add_argument(
         "--cover-letter-template",
         default="app/templates/cover_letter.txt",
         help="Path to cover letter template with placeholders",
     )
+    parser.add_argument(
+        "--artifact-mode",
+        choices=ARTIFACT_MODES,
+        default="sharded",
+        help="Store cover letters as sharded files or in one append-only pack per run",
+    )
     parser.add_argument("--auto-approve", action="store_true", help="Skip review prompts even if review_mode is on")
-    parser.add_argument("--dry-run", action="store_true", help="Score jobs without creating logs or artifacts")
-    return parser.parse_args()
+    parser.add_argument("--dry-run", action="store_true", help="Score jobs without creating logs, caches or artifacts")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process listings that are new or changed since the last run and skip jobs already applied to",
+    )
+    parser.add_argument("--dedupe", action="store_true", help="Merge duplicate listings across sources before scoring")
+    parser.add_argument("--stream", action="store_true", help="Stream listings and keep only the best --top-k in memory")
+    parser.add_argument("--top-k", type=int, default=50, help="Number of matches retained in --stream mode")
+    parser.add_argument(
+        "--score-workers",
+        type=int,
+        default=1,
+        help="Score a single .corpus in --stream mode across this many processes (results match the serial path)",
+    )
+    parser.add_argument(
+        "--semantic-candidates",
+        type=int,
+        default=0,
+        help="Shortlist this many listings from the semantic index before keyword scoring (0 scores every listing)",
+    )
+    parser.add_argument("--semantic-index", default=str(DEFAULT_INDEX_PATH), help="Path to the persisted semantic index")
+    parser.add_argument("--semantic-retrain", action="store_true", help="Refit the semantic model on the current listings")
+    parser.add_argument("--resume-cache", default=str(DEFAULT_RESUME_CACHE_DIR), help="Directory for parsed resume cache")
+    parser.add_argument("--no-resume-cache", action="store_true", help="Always re-extract and re-parse the resume")
+    parser.add_argument(
+        "--feature-cache",
+        nargs="?",
+        const=str(DEFAULT_CACHE_PATH),
+        default=None,
+        help="Reuse listing tokens across runs from this SQLite cache (opt-in; only repeat runs over the same listings gain)",
+    )
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings, throttle waits and DB latency")
+    parser.add_argument("--profile-json", default=None, help="Also write the collected metrics as JSON to this path")
+    parser.add_argument("--cprofile", default=None, help="Capture a cProfile of the whole run into this .pstats file")
+    args = parser.parse_args()
+    if args.stream and (args.incremental or args.dedupe):
+        parser.error("--incremental and --dedupe need the gathered job list and cannot be combined with --stream")
+    return args
+
+
+def _write_profile(args: argparse.Namespace) -> None:
+    print(metrics.report())
+    if args.profile_json:
+        path = Path(args.profile_json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(metrics.to_json(), encoding="utf-8")
+        print(f"Metrics written to {args.profile_json}")
 
 
 def _print_top_matches(matches: List[MatchResult], limit: int) -> None:
+    if not matches:
+        print("No listings reached the minimum score.")
+        return
     print("Top matches:")
     for match in matches[:limit]:
         job = match.job
@@ -0,0 +1,87 @@
+from app.dedup import dedupe_jobs
+from app.models import JobListing
+
+DESCRIPTION = (
+    "We are hiring an engineer to build and operate our python services, design apis, "
+    "own postgres schemas and ship features with a small product team."
+)
+
+
+def _job(job_id: str, company: str, title: str, location: str, description: str = DESCRIPTION) -> JobListing:
+    return JobListing(id=job_id, title=title, company=company, location=location, description=description)
+
+
+OTHER_DESCRIPTION = (
+    "Join the platform group to run kubernetes clusters, automate terraform deployments, "
+    "tune observability dashboards and carry a shared on-call pager."
+)
+
+
+def test_same_posting_at_other_companies_is_kept():
+    result = dedupe_jobs(
+        [
+            _job("1", "Acme", "Backend Engineer", "New York"),
+            _job("2", "Globex", "Backend Engineer", "New York"),
+            _job("3", "Initech", "Backend Engineer", "New York"),
+        ]
+    )
+    assert [job.id for job in result.jobs] == ["1", "2", "3"]
+    assert result.merged == {}
+
+
+def test_identical_posting_is_an_exact_duplicate():
+    result = dedupe_jobs(
+        [
+            _job("1", "Acme", "Backend Engineer", "New York"),
+            _job("2", "ACME", "Backend  Engineer!", "New York"),
+        ]
+    )
+    assert [job.id for job in result.jobs] == ["1"]
+    assert result.exact_duplicates == 1
+    assert result.merged == {"1": ["2"]}
+
+
+def test_different_description_with_same_company_title_and_location_is_kept():
+    result = dedupe_jobs(
+        [
+            _job("1", "Acme", "Backend Engineer", "New York"),
+            _job("2", "Acme", "Backend Engineer", "New York", OTHER_DESCRIPTION),
+        ]
+    )
+    assert [job.id for job in result.jobs] == ["1", "2"]
+    assert result.merged_count == 0
+
+
+def test_location_spelling_does_not_split_a_posting():
+    result = dedupe_jobs(
+        [
+            _job("1", "Acme", "Backend Engineer", "New York, NY"),
+            _job("2", "Acme", "Backend Engineer", "New York"),
+        ]
+    )
+    assert [job.id for job in result.jobs] == ["1"]
+    assert result.merged == {"1": ["2"]}
+
+
+def test_seniority_prefix_and_company_suffix_are_merged():
+    result = dedupe_jobs(
+        [
+            _job("1", "Acme Corp", "Sr. Backend Engineer", "New York"),
+            _job("2", "Acme", "Backend Engineer", "New York"),
+        ]
+    )
+    assert [job.id for job in result.jobs] == ["1"]
+    assert result.near_duplicates == 1
+    assert result.merged == {"1": ["2"]}
+
+
+def test_near_duplicate_of_same_posting_is_merged():
+    result = dedupe_jobs(
+        [
+            _job("1", "Acme", "Backend Engineer", "New York"),
+            _job("2", "Acme, Inc.", "Engineer - Backend", "New York", DESCRIPTION + " Apply today!"),
+        ]
+    )
+    assert [job.id for job in result.jobs] == ["1"]
+    assert result.near_duplicates == 1
+    assert result.merged == {"1": ["2"]}
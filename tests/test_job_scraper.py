@@ -0,0 +1,81 @@
+import threading
+import time
+
+from app.job_scraper import StaticScraper, gather_jobs_concurrent
+from app.models import JobListing
+
+
+def _jobs(prefix: str, count: int = 2):
+    return [
+        JobListing(id=f"{prefix}-{index}", title="Backend Engineer", company="Acme", location="Remote", description="")
+        for index in range(count)
+    ]
+
+
+class FailingScraper(StaticScraper):
+    def fetch_jobs(self, keywords, locations):
+        raise RuntimeError("board is down")
+
+
+class CountingScraper(StaticScraper):
+    # records how many fetches run at once across every instance sharing ``state``
+    def __init__(self, name, delay, state):
+        super().__init__(_jobs(name), delay=delay, name=name)
+        self.state = state
+
+    def fetch_jobs(self, keywords, locations):
+        with self.state["lock"]:
+            self.state["active"] += 1
+            self.state["peak"] = max(self.state["peak"], self.state["active"])
+        try:
+            return super().fetch_jobs(keywords, locations)
+        finally:
+            with self.state["lock"]:
+                self.state["active"] -= 1
+
+
+def test_slow_source_times_out_without_holding_up_the_rest():
+    started = time.perf_counter()
+    result = gather_jobs_concurrent(
+        [StaticScraper(_jobs("slow"), delay=2.0, name="slow"), StaticScraper(_jobs("fast"), name="fast")],
+        [],
+        [],
+        max_workers=2,
+        timeout=0.2,
+    )
+    assert time.perf_counter() - started < 1.0
+    assert [job.id for job in result.jobs] == ["fast-0", "fast-1"]
+    assert [name for name, _ in result.failures] == ["slow"]
+    assert result.failures[0][1].startswith("timed out")
+    assert set(result.durations) == {"slow", "fast"}
+
+
+def test_partial_results_come_back_alongside_failures():
+    result = gather_jobs_concurrent(
+        [
+            StaticScraper(_jobs("a"), name="a"),
+            FailingScraper([], name="broken"),
+            StaticScraper(_jobs("b"), delay=0.05, name="b"),
+        ],
+        [],
+        [],
+        max_workers=3,
+        timeout=1.0,
+    )
+    assert [job.id for job in result.jobs] == ["a-0", "a-1", "b-0", "b-1"]
+    assert result.failures == [("broken", "RuntimeError: board is down")]
+
+
+def test_abandoned_sources_still_count_against_max_workers():
+    state = {"lock": threading.Lock(), "active": 0, "peak": 0}
+    scrapers = [CountingScraper(f"s{index}", 0.4, state) for index in range(5)]
+    result = gather_jobs_concurrent(scrapers, [], [], max_workers=2, timeout=0.1)
+    assert result.jobs == []
+    assert len(result.failures) == 5
+    assert all(error.startswith("timed out") for _, error in result.failures)
+    # let the abandoned fetches run out, then check they never overlapped more than max_workers
+    deadline = time.perf_counter() + 2.0
+    while state["active"] and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    assert state["active"] == 0
+    assert state["peak"] == 2
@@ -0,0 +1,50 @@
+import pytest
+
+from app.corpus import JobCorpus, write_corpus
+from app.matching import top_k_matches
+from app.models import Resume, UserPreferences
+from app.sharded_scoring import ShardedScorer, shard_ranges, sharded_top_k
+from benchmarks.synthetic import generate_jobs
+
+RESUME = Resume(raw_text="", skills=["python", "aws", "docker", "kubernetes", "react", "sql"])
+PREFS = UserPreferences(
+    target_locations=["Remote", "New York"],
+    target_titles=["Backend Engineer", "Software Engineer"],
+    required_skills=["python", "aws"],
+    optional_skills=["docker", "react"],
+    min_score=0.3,
+)
+
+
+@pytest.fixture(scope="module")
+def corpus_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("corpus") / "jobs.corpus"
+    write_corpus(generate_jobs(300), path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def scorer(corpus_path):
+    with ShardedScorer(corpus_path, workers=2) as scorer:
+        yield scorer
+
+
+@pytest.mark.parametrize("shards", [1, 3, 7])
+@pytest.mark.parametrize("min_score", [None, 0.3])
+@pytest.mark.parametrize("k", [1, 5, None])
+def test_sharded_matches_serial(scorer, corpus_path, k, min_score, shards):
+    with JobCorpus(corpus_path) as corpus:
+        expected = top_k_matches(RESUME, corpus, PREFS, k=k, min_score=min_score)
+    assert expected
+    assert scorer.top_k(RESUME, PREFS, k=k, min_score=min_score, shards=shards) == expected
+
+
+def test_sharded_top_k_matches_serial(corpus_path):
+    with JobCorpus(corpus_path) as corpus:
+        expected = top_k_matches(RESUME, corpus, PREFS, k=5, min_score=0.3)
+    assert sharded_top_k(RESUME, corpus_path, PREFS, k=5, min_score=0.3, workers=2) == expected
+
+
+def test_shard_ranges_cover_every_row_once():
+    assert shard_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert shard_ranges(2, 7) == [(0, 1), (1, 2)]
@@ -0,0 +1,14 @@
+from app.skill_matcher import SkillMatcher
+
+
+def test_plus_and_hash_are_part_of_a_word():
+    matcher = SkillMatcher(["c", "f", "c++", "c#", "f#"])
+    assert matcher.find("Shipped C++ and C# services") == ["c++", "c#"]
+    assert matcher.find("Functional work in F#.") == ["f#"]
+    assert matcher.find("Embedded C, some C++/C#") == ["c", "c++", "c#"]
+
+
+def test_symbols_join_words_unless_the_skill_has_them():
+    matcher = SkillMatcher(["go", "python", "c++"])
+    assert matcher.find("go+python and c++") == ["c++"]
+    assert matcher.find("go, python; c++!") == ["go", "python", "c++"]